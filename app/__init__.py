@@ -1,9 +1,12 @@
-from flask import Flask
+from flask import Flask, has_app_context
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager
 from flask_migrate import Migrate
 from celery import Celery
+from celery.signals import worker_process_init
+from kombu.serialization import register
 from config import Config
+import orjson
 import os
 
 db = SQLAlchemy()
@@ -13,28 +16,76 @@ migrate = Migrate()
 # Create Celery instance
 celery = Celery(__name__)
 
-def make_celery(app):
-    """Configure Celery with Flask app context"""
+# Faster drop-in for the stdlib json serializer on task messages and results
+register('orjson', orjson.dumps, orjson.loads,
+         content_type='application/x-orjson', content_encoding='utf-8')
+
+def make_celery(app=None):
+    """
+    Configure Celery with Flask app context.
+    
+    Without an app, Celery is configured straight from Config and the Flask
+    app is only created when the first task runs (see get_app).
+    """
+    if app is not None:
+        config = app.config
+        celery.flask_app = app
+    else:
+        config = {key: getattr(Config, key) for key in dir(Config) if key.isupper()}
+    
     celery.conf.update(
-        broker_url=app.config['CELERY_BROKER_URL'],
-        result_backend=app.config['CELERY_RESULT_BACKEND'],
-        task_serializer='json',
-        result_serializer='json',
-        accept_content=['json'],
+        broker_url=config['CELERY_BROKER_URL'],
+        result_backend=config['CELERY_RESULT_BACKEND'],
+        task_serializer='orjson',
+        result_serializer='orjson',
+        # Still accept json so messages queued before the switch are consumed
+        accept_content=['orjson', 'json'],
+        result_accept_content=['orjson', 'json'],
         timezone='UTC',
         enable_utc=True,
         task_track_started=True,
         task_send_sent_event=True,
+        include=['app.jobs.tasks'],
+        # Reuse pooled, kept-alive Redis connections for publishes and results
+        broker_pool_limit=20,
+        broker_connection_retry_on_startup=True,
+        broker_transport_options={'socket_keepalive': True, 'health_check_interval': 30},
+        redis_socket_keepalive=True,
+        redis_backend_health_check_interval=30,
+        result_backend_transport_options={'retry_policy': {'timeout': 5.0}},
+        # Long tasks: don't hold reserved tasks behind a running import
+        task_acks_late=config['CELERY_ACKS_LATE'],
+        worker_prefetch_multiplier=config['CELERY_PREFETCH_MULTIPLIER'],
     )
     
+    # Tasks run inside the app context of the long-lived Flask app,
+    # so they can use current_app and db directly instead of building an app
     class ContextTask(celery.Task):
         def __call__(self, *args, **kwargs):
-            with app.app_context():
+            # Tasks called directly or eagerly from a request reuse its context
+            if has_app_context():
+                return self.run(*args, **kwargs)
+            with get_app().app_context():
                 return self.run(*args, **kwargs)
     
     celery.Task = ContextTask
     return celery
 
+def get_app():
+    """Return the Flask app used by Celery tasks, creating it on first use"""
+    app = getattr(celery, 'flask_app', None)
+    if app is None:
+        app = create_app()
+    return app
+
+@worker_process_init.connect
+def init_worker_process(**kwargs):
+    """Create the Flask app once per worker process with its own connection pool"""
+    app = get_app()
+    with app.app_context():
+        # Drop any connections inherited from the parent across fork
+        db.engine.dispose()
+
 def create_app(config_class=Config):
     app = Flask(__name__)
     app.config.from_object(config_class)
@@ -82,6 +133,5 @@ def create_app(config_class=Config):
     
     return app
 
-# For Celery worker - create app and configure celery
-app = create_app()
-celery_app = make_celery(app)
+# For Celery worker - the Flask app is created lazily in each worker process
+celery_app = make_celery()
@@ -1,16 +1,100 @@
-from celery import shared_task
+from celery import shared_task, group, chord
 from app import db
 from app.models.email import Email, Batch, RejectedEmail, IgnoreDomain, SuppressionList, GuestEmailItem
 from app.models.job import Job, DomainReputation, DownloadHistory, GuestDownloadHistory
 from app.models.user import User
+from app.utils.progress import publish_progress, progress_throttle
 from app.utils.email_validator import (
-    validate_email_full, extract_domain, classify_domain
+    make_validator, extract_domain, classify_domain, resolve_mx_bulk
 )
 import csv
+import io
 import os
+import re
 import zipfile
 from datetime import datetime
+from itertools import chain, islice
 from flask import current_app
+from sqlalchemy import exists, text, update
+from sqlalchemy.exc import DBAPIError, SQLAlchemyError
+
+# Maximum number of values bound into a single IN (...) clause
+IN_CLAUSE_CHUNK_SIZE = 5000
+
+# Block size for reading uploaded files
+READ_BLOCK_SIZE = 1024 * 1024
+
+# One line with its terminator; \r\n, \r and \n all end a line, as in
+# universal newlines mode
+LINE_PATTERN = re.compile(r'[^\r\n]*(?:\r\n?|\n)')
+
+# Default emails validated and written back per page in validate_emails_task
+# (overridden by the VALIDATION_PAGE_SIZE setting)
+VALIDATION_PAGE_SIZE = 1000
+
+# Rows fetched per round trip when streaming exports, and export file buffer size
+EXPORT_FETCH_SIZE = 5000
+WRITE_BUFFER_SIZE = 1024 * 1024
+
+# CSV export column headers and value formatting, by field name
+EXPORT_HEADERS = {
+    'email': 'Email',
+    'domain': 'Domain',
+    'quality_score': 'Quality Score',
+    'uploaded_at': 'Uploaded At',
+    'domain_category': 'Domain Category',
+    'is_valid': 'Is Valid',
+}
+EXPORT_VALUE_GETTERS = {
+    'email': lambda row: row.email,
+    'domain': lambda row: row.domain,
+    'quality_score': lambda row: row.quality_score or '',
+    'uploaded_at': lambda row: row.uploaded_at.strftime('%Y-%m-%d %H:%M:%S'),
+    'domain_category': lambda row: row.domain_category or '',
+    'is_valid': lambda row: 'Yes' if row.is_valid else 'No' if row.is_valid is False else '',
+}
+# None of these values can hold a comma, quote or line break (addresses and
+# domains are syntax-checked on import), so CSV rows made only of them are
+# joined directly instead of going through csv quoting
+CSV_SAFE_FIELDS = frozenset(EXPORT_VALUE_GETTERS)
+
+
+def _guest_item_status(item):
+    """Status column for a guest export item"""
+    if item.matched_email:
+        if item.matched_email.is_validated:
+            return 'Valid' if item.matched_email.is_valid else 'Invalid'
+        return 'Unverified'
+    if item.result == 'rejected':
+        return 'Rejected'
+    return 'Unknown'
+
+
+GUEST_EXPORT_HEADERS = {
+    'email': 'Email',
+    'domain': 'Domain',
+    'result': 'Result',
+    'status': 'Status',
+    'quality_score': 'Quality Score',
+    'rejected_reason': 'Rejected Reason',
+}
+GUEST_EXPORT_VALUE_GETTERS = {
+    'email': lambda item: item.email_normalized,
+    'domain': lambda item: item.domain,
+    'result': lambda item: item.result,
+    'status': _guest_item_status,
+    'quality_score': lambda item: (item.matched_email.quality_score or '') if item.matched_email else '',
+    'rejected_reason': lambda item: item.rejected_reason or '',
+}
+# Guest export fields written by a direct join when a row's values need no
+# csv quoting; rejected items keep raw input, so each row is still checked
+GUEST_CSV_JOIN_FIELDS = frozenset({'email', 'domain', 'result', 'status', 'quality_score'})
+
+# Smallest batch written with COPY; below this a plain executemany is cheaper
+COPY_MIN_ROWS = 100
+
+# Field order of the rejected-row tuples buffered during import
+REJECTED_COLUMNS = ('email', 'domain', 'reason', 'details', 'batch_id', 'job_id')
 
 @shared_task(bind=True)
 def import_emails_task(self, batch_id, file_path, user_id, consent_granted=False):
@@ -21,287 +105,505 @@ def import_emails_task(self, batch_id, file_path, user_id, consent_granted=False
     For guest users: Creates GuestEmailItem records for all uploaded emails
     (including duplicates) while only inserting new unique emails into main emails table.
     """
-    from app import create_app
-    app = create_app()
-    
-    with app.app_context():
-        try:
-            # Get or create job record
-            job = Job.query.filter_by(job_id=self.request.id).first()
-            if not job:
-                job = Job(
-                    job_id=self.request.id,
-                    job_type='import',
-                    user_id=user_id,
-                    batch_id=batch_id,
-                    status='running'
-                )
-                db.session.add(job)
-                db.session.commit()
-            
-            job.status = 'running'
-            job.started_at = datetime.utcnow()
-            
-            batch = Batch.query.get(batch_id)
-            if not batch:
-                raise Exception(f'Batch {batch_id} not found')
-            
-            # Check if user is guest
-            user = User.query.get(user_id)
-            is_guest = user.is_guest() if user else False
-            
-            # Get ignore domains
-            ignore_domains = [d.domain for d in IgnoreDomain.query.all()]
-            
-            # Get suppression list
-            suppressed_emails = set([s.email for s in SuppressionList.query.all()])
-            
-            # Read file and count total
-            emails_to_process = []
-            seen_emails = set()
-            
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                reader = csv.reader(f)
-                for row in reader:
-                    if row and len(row) > 0:
-                        email = row[0].strip().lower()
-                        if email and '@' in email:
-                            emails_to_process.append(email)
-            
-            job.total = len(emails_to_process)
+    job = None
+    try:
+        # Get or create job record
+        job = Job.query.filter_by(job_id=self.request.id).first()
+        if not job:
+            job = Job(
+                job_id=self.request.id,
+                job_type='import',
+                user_id=user_id,
+                batch_id=batch_id,
+                status='running'
+            )
+            db.session.add(job)
             db.session.commit()
-            
-            imported_count = 0
-            rejected_count = 0
-            duplicate_count = 0
-            guest_inserted_count = 0
-            guest_duplicate_count = 0
-            
-            for idx, email in enumerate(emails_to_process):
+        
+        job.status = 'running'
+        job.started_at = datetime.utcnow()
+        
+        batch = Batch.query.get(batch_id)
+        if not batch:
+            raise Exception(f'Batch {batch_id} not found')
+        
+        # Check if user is guest
+        user = User.query.get(user_id)
+        is_guest = user.is_guest() if user else False
+        
+        # Get ignore domains and fix the validation flags for the whole import
+        ignore_domains = _load_ignore_domains()
+        validate_email = make_validator(ignore_domains=ignore_domains)
+        
+        # Count rows up front for progress; emails are streamed in chunks
+        # below so peak memory is bounded by one chunk
+        seen_emails = set()
+        
+        job.total = _count_file_rows(file_path)
+        db.session.commit()
+        
+        imported_count = 0
+        rejected_count = 0
+        duplicate_count = 0
+        guest_inserted_count = 0
+        guest_duplicate_count = 0
+        
+        # Rows are accumulated as plain dicts and written with bulk inserts
+        # instead of one ORM object (and INSERT) per email
+        pending_emails = []
+        pending_rejects = []
+        pending_guest_items = []
+        pending_guest_emails = []  # (email row, guest item) pairs awaiting the new email's id
+        flush_size = current_app.config.get('IMPORT_BATCH_SIZE', 1000)
+        domain_categories = {}
+        
+        # Columns shared by every email row this import inserts
+        email_row_fields = {
+            'batch_id': batch_id,
+            'uploaded_by': user_id,
+            'consent_granted': consent_granted,
+            'is_validated': False
+        }
+        
+        # Live progress is published by wall-clock time; the job row and Celery
+        # state are written every PROGRESS_COMMIT_INTERVAL rows
+        commit_interval = current_app.config.get('PROGRESS_COMMIT_INTERVAL', 10000)
+        progress_due = progress_throttle(current_app.config.get('PROGRESS_REPORT_INTERVAL', 1.0))
+        
+        local_errors = 0
+        idx = -1
+        for email_chunk in _iter_email_chunks(file_path, flush_size):
+            # Look up only this chunk's emails in the suppression list
+            suppressed_emails = _fetch_suppressed(email_chunk)
+            
+            # Guests link to emails already in the main table; look them all up
+            # with one query per chunk instead of one SELECT per email
+            existing_email_ids = _fetch_existing_email_ids(email_chunk) if is_guest else {}
+            
+            # Extract each row's domain once, and classify each distinct
+            # domain once instead of once per row
+            chunk_domains = [extract_domain(e) for e in email_chunk]
+            for domain in set(chunk_domains):
+                if domain and domain not in domain_categories:
+                    domain_categories[domain] = classify_domain(domain)
+            
+            # Counters as of the start of the chunk, restored if its write fails
+            chunk_start_counts = (imported_count, rejected_count, duplicate_count,
+                                  guest_inserted_count, guest_duplicate_count, local_errors)
+            chunk_seen = []
+            
+            chunk_errors = []
+            for email, domain in zip(email_chunk, chunk_domains):
+                idx += 1
                 try:
-                    # Check for duplicates in current batch
+                    # Check for duplicates in current batch. Guest items are
+                    # unique per (batch, email), so a repeat gets no second
+                    # item; it is only recorded as a duplicate reject
                     if email in seen_emails:
-                        duplicate_count += 1
-                        rejected = RejectedEmail(
-                            email=email,
-                            domain=extract_domain(email) or 'unknown',
-                            reason='duplicate',
-                            details='Duplicate in current batch',
-                            batch_id=batch_id,
-                            job_id=job.id
-                        )
-                        db.session.add(rejected)
-                        
-                        # For guest users, still track the duplicate item
                         if is_guest:
-                            domain = extract_domain(email)
-                            guest_item = GuestEmailItem(
-                                batch_id=batch_id,
-                                user_id=user_id,
-                                email_normalized=email,
-                                domain=domain or 'unknown',
-                                result='rejected',
-                                rejected_reason='duplicate',
-                                rejected_details='Duplicate in current batch'
-                            )
-                            db.session.add(guest_item)
+                            guest_duplicate_count += 1
+                        else:
+                            duplicate_count += 1
+                        pending_rejects.append((email, domain or 'unknown', 'duplicate', 'Duplicate in current batch', batch_id, job.id))
                         continue
                     
                     seen_emails.add(email)
+                    chunk_seen.append(email)
                     
                     # Check if in suppression list
                     if email in suppressed_emails:
                         rejected_count += 1
-                        rejected = RejectedEmail(
-                            email=email,
-                            domain=extract_domain(email) or 'unknown',
-                            reason='suppressed',
-                            details='Email in suppression list',
-                            batch_id=batch_id,
-                            job_id=job.id
-                        )
-                        db.session.add(rejected)
+                        pending_rejects.append((email, domain or 'unknown', 'suppressed', 'Email in suppression list', batch_id, job.id))
                         
                         # For guest users, track rejected item
                         if is_guest:
-                            domain = extract_domain(email)
-                            guest_item = GuestEmailItem(
-                                batch_id=batch_id,
-                                user_id=user_id,
-                                email_normalized=email,
-                                domain=domain or 'unknown',
-                                result='rejected',
-                                rejected_reason='suppressed',
-                                rejected_details='Email in suppression list'
-                            )
-                            db.session.add(guest_item)
+                            pending_guest_items.append({
+                                'batch_id': batch_id,
+                                'user_id': user_id,
+                                'email_normalized': email,
+                                'domain': domain or 'unknown',
+                                'result': 'rejected',
+                                'rejected_reason': 'suppressed',
+                                'rejected_details': 'Email in suppression list'
+                            })
                         continue
                     
                     # Validate with all filters
-                    is_valid, error_type, error_message = validate_email_full(
-                        email,
-                        check_dns=False,
-                        check_role=False,
-                        ignore_domains=ignore_domains
-                    )
-                    
-                    domain = extract_domain(email)
+                    is_valid, error_type, error_message = validate_email(email, domain)
                     
                     if not is_valid:
                         # Reject email
                         rejected_count += 1
-                        rejected = RejectedEmail(
-                            email=email,
-                            domain=domain or 'unknown',
-                            reason=error_type,
-                            details=error_message,
-                            batch_id=batch_id,
-                            job_id=job.id
-                        )
-                        db.session.add(rejected)
+                        pending_rejects.append((email, domain or 'unknown', error_type, error_message, batch_id, job.id))
                         
                         # For guest users, track rejected item
                         if is_guest:
-                            guest_item = GuestEmailItem(
-                                batch_id=batch_id,
-                                user_id=user_id,
-                                email_normalized=email,
-                                domain=domain or 'unknown',
-                                result='rejected',
-                                rejected_reason=error_type,
-                                rejected_details=error_message
-                            )
-                            db.session.add(guest_item)
+                            pending_guest_items.append({
+                                'batch_id': batch_id,
+                                'user_id': user_id,
+                                'email_normalized': email,
+                                'domain': domain or 'unknown',
+                                'result': 'rejected',
+                                'rejected_reason': error_type,
+                                'rejected_details': error_message
+                            })
                     else:
                         # For guest users: Check if email already exists in main DB
                         if is_guest:
                             # Check if email already exists globally (case-insensitive)
-                            # TODO: Consider adding index on LOWER(email) for better performance
-                            existing_email = Email.query.filter(
-                                db.func.lower(Email.email) == email.lower()
-                            ).first()
+                            existing_email_id = existing_email_ids.get(email)
                             
-                            if existing_email:
+                            if existing_email_id:
                                 # Email is a duplicate - don't insert into emails table
                                 # But create guest item to track it
                                 guest_duplicate_count += 1
-                                guest_item = GuestEmailItem(
-                                    batch_id=batch_id,
-                                    user_id=user_id,
-                                    email_normalized=email,
-                                    domain=domain,
-                                    result='duplicate',
-                                    matched_email_id=existing_email.id
-                                )
-                                db.session.add(guest_item)
+                                pending_guest_items.append({
+                                    'batch_id': batch_id,
+                                    'user_id': user_id,
+                                    'email_normalized': email,
+                                    'domain': domain,
+                                    'result': 'duplicate',
+                                    'matched_email_id': existing_email_id
+                                })
                             else:
-                                # Email is new - insert into emails table
-                                domain_category = classify_domain(domain)
-                                
-                                email_obj = Email(
-                                    email=email,
-                                    domain=domain,
-                                    domain_category=domain_category,
-                                    batch_id=batch_id,
-                                    uploaded_by=user_id,
-                                    consent_granted=consent_granted,
-                                    is_validated=False
-                                )
-                                db.session.add(email_obj)
-                                db.session.flush()  # Get the ID
+                                # Email is new - insert into emails table; the
+                                # guest item gets its id when the chunk is written
+                                guest_item = {
+                                    'batch_id': batch_id,
+                                    'user_id': user_id,
+                                    'email_normalized': email,
+                                    'domain': domain,
+                                    'result': 'inserted',
+                                    'matched_email_id': None
+                                }
+                                pending_guest_emails.append(({
+                                    'email': email,
+                                    'domain': domain,
+                                    'domain_category': domain_categories[domain],
+                                    **email_row_fields
+                                }, guest_item))
+                                pending_guest_items.append(guest_item)
                                 
                                 guest_inserted_count += 1
-                                
-                                # Create guest item linking to new email
-                                guest_item = GuestEmailItem(
-                                    batch_id=batch_id,
-                                    user_id=user_id,
-                                    email_normalized=email,
-                                    domain=domain,
-                                    result='inserted',
-                                    matched_email_id=email_obj.id
-                                )
-                                db.session.add(guest_item)
                         else:
                             # Regular user: Import email normally
-                            domain_category = classify_domain(domain)
-                            
-                            email_obj = Email(
-                                email=email,
-                                domain=domain,
-                                domain_category=domain_category,
-                                batch_id=batch_id,
-                                uploaded_by=user_id,
-                                consent_granted=consent_granted,
-                                is_validated=False
-                            )
-                            db.session.add(email_obj)
+                            pending_emails.append({
+                                'email': email,
+                                'domain': domain,
+                                'domain_category': domain_categories[domain],
+                                **email_row_fields
+                            })
                             imported_count += 1
                     
-                    # Update progress every 100 emails
-                    if (idx + 1) % 100 == 0:
-                        job.update_progress(idx + 1)
-                        db.session.commit()
+                    # Publish live progress to Redis at most once per report
+                    # interval; the clock is only read every 100 emails
+                    if (idx + 1) % 100 == 0 and progress_due():
+                        publish_progress(job.job_id, idx + 1, job.total, job.errors + local_errors + len(chunk_errors))
+                    
+                    if (idx + 1) % commit_interval == 0:
+                        # Persisted by the next chunk commit instead of committing here
+                        percent = (idx + 1) / job.total * 100 if job.total else 0.0
+                        db.session.execute(
+                            update(Job).where(Job.id == job.id).values(
+                                processed=idx + 1,
+                                progress_percent=percent
+                            )
+                        )
                         
-                        # Update Celery task state
+                        # Update Celery task state with the percent just written
                         self.update_state(
                             state='PROGRESS',
                             meta={
                                 'current': idx + 1,
                                 'total': job.total,
-                                'percent': job.progress_percent
+                                'percent': percent
                             }
                         )
                 
                 except Exception as e:
-                    job.errors += 1
-                    print(f"Error processing email {email}: {str(e)}")
-            
-            # Final commit
-            db.session.commit()
-            
-            # Update batch statistics
-            if is_guest:
-                batch.total_count = guest_inserted_count
-                batch.rejected_count = rejected_count
-                batch.duplicate_count = guest_duplicate_count
-            else:
-                batch.total_count = imported_count
-                batch.rejected_count = rejected_count
-                batch.duplicate_count = duplicate_count
-            
-            batch.status = 'uploaded'
+                    chunk_errors.append(f"{email}: {str(e)}")
+            
+            # Report row errors once per chunk rather than printing each one
+            if chunk_errors:
+                local_errors += len(chunk_errors)
+                print(f"Error processing {len(chunk_errors)} email(s) up to row {idx + 1}: "
+                      + '; '.join(chunk_errors[:5]))
+            
+            # Write each chunk's rows in one multi-row INSERT per table inside a
+            # savepoint, so a failed chunk is rolled back without losing the rest
+            _defer_commit_sync()
+            try:
+                with db.session.begin_nested():
+                    _flush_import_rows(pending_emails, pending_rejects, pending_guest_items, pending_guest_emails)
+            except SQLAlchemyError as e:
+                # None of the chunk was saved: undo its counts, count every row
+                # as an error and let later chunks import its emails again
+                (imported_count, rejected_count, duplicate_count,
+                 guest_inserted_count, guest_duplicate_count, local_errors) = chunk_start_counts
+                local_errors += len(email_chunk)
+                seen_emails.difference_update(chunk_seen)
+                print(f"Error writing import chunk ending at row {idx + 1}: {str(e)}")
+                pending_emails.clear()
+                pending_rejects.clear()
+                pending_guest_items.clear()
+                pending_guest_emails.clear()
             db.session.commit()
-            
-            # Complete job
-            if is_guest:
-                message = f'Imported {guest_inserted_count} new emails, {guest_duplicate_count} duplicates, {rejected_count} rejected'
-                result_data = {
-                    'imported': guest_inserted_count,
-                    'duplicates': guest_duplicate_count,
-                    'rejected': rejected_count
-                }
-            else:
-                message = f'Imported {imported_count} emails, rejected {rejected_count}, duplicates {duplicate_count}'
-                result_data = {
-                    'imported': imported_count,
-                    'rejected': rejected_count,
-                    'duplicates': duplicate_count
-                }
-            
-            job.complete(message=message, result_data=result_data)
-            
-            return {
-                'status': 'completed',
-                'imported': guest_inserted_count if is_guest else imported_count,
+        
+        # Row count included lines without an email; settle on what was processed
+        job.total = idx + 1
+        job.update_progress(idx + 1)
+        
+        # Add this run's error count atomically rather than read-modify-write
+        if local_errors:
+            db.session.execute(
+                update(Job).where(Job.id == job.id).values(errors=Job.errors + local_errors)
+            )
+        
+        # Update batch statistics in a single UPDATE
+        db.session.execute(
+            update(Batch).where(Batch.id == batch_id).values(
+                total_count=guest_inserted_count if is_guest else imported_count,
+                rejected_count=rejected_count,
+                duplicate_count=guest_duplicate_count if is_guest else duplicate_count,
+                status='uploaded'
+            )
+        )
+        db.session.commit()
+        
+        # Complete job
+        if is_guest:
+            message = f'Imported {guest_inserted_count} new emails, {guest_duplicate_count} duplicates, {rejected_count} rejected'
+            result_data = {
+                'imported': guest_inserted_count,
+                'duplicates': guest_duplicate_count,
+                'rejected': rejected_count
+            }
+        else:
+            message = f'Imported {imported_count} emails, rejected {rejected_count}, duplicates {duplicate_count}'
+            result_data = {
+                'imported': imported_count,
                 'rejected': rejected_count,
-                'duplicates': guest_duplicate_count if is_guest else duplicate_count
+                'duplicates': duplicate_count
             }
-            
-        except Exception as e:
-            if job:
-                job.fail(str(e))
-            raise
+        
+        job.complete(message=message, result_data=result_data)
+        
+        return {
+            'status': 'completed',
+            'imported': guest_inserted_count if is_guest else imported_count,
+            'rejected': rejected_count,
+            'duplicates': guest_duplicate_count if is_guest else duplicate_count
+        }
+        
+    except Exception as e:
+        # Discard the failed transaction so the failure itself can be recorded
+        db.session.rollback()
+        if job:
+            job.fail(str(e))
+        raise
+
+
+def _chunked(items, size):
+    """Split a list into consecutive slices of at most size items"""
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+# Ignore domains loaded by this worker process, with the table version they came from
+_ignore_domains_cache = {'version': None, 'domains': frozenset()}
+
+def _load_ignore_domains():
+    """
+    Load ignore domains as a lowercase frozenset for O(1) membership tests.
+    The set is kept per worker process and only reloaded when the table's
+    (row count, max id, latest added_at) changes, i.e. after a domain is
+    added or deleted.
+    """
+    version = tuple(db.session.query(
+        db.func.count(IgnoreDomain.id),
+        db.func.max(IgnoreDomain.id),
+        db.func.max(IgnoreDomain.added_at)
+    ).one())
+    if version != _ignore_domains_cache['version']:
+        _ignore_domains_cache['domains'] = frozenset(
+            domain.lower() for (domain,) in IgnoreDomain.query.with_entities(IgnoreDomain.domain)
+        )
+        _ignore_domains_cache['version'] = version
+    return _ignore_domains_cache['domains']
+
+def _fetch_suppressed(emails):
+    """Return the subset of emails that are in the suppression list"""
+    suppressed = set()
+    for email_slice in _chunked(list(set(emails)), IN_CLAUSE_CHUNK_SIZE):
+        rows = db.session.query(SuppressionList.email).filter(
+            SuppressionList.email.in_(email_slice)
+        ).all()
+        suppressed.update(row.email for row in rows)
+    return suppressed
+
+def _fetch_existing_email_ids(emails):
+    """
+    Map each of the given lowercase emails that already exists in the emails
+    table (case-insensitively) to the id of a matching row
+    """
+    existing = {}
+    lowered = db.func.lower(Email.email)
+    for email_slice in _chunked(list(set(emails)), IN_CLAUSE_CHUNK_SIZE):
+        rows = db.session.query(lowered, Email.id).filter(lowered.in_(email_slice)).all()
+        for email, email_id in rows:
+            existing.setdefault(email, email_id)
+    return existing
+
+def _count_file_rows(file_path):
+    """Count lines in a file without decoding it, for progress totals"""
+    count = 0
+    last = b''
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(READ_BLOCK_SIZE), b''):
+            # \r\n, \r and \n each end one line
+            count += block.count(b'\n') + block.count(b'\r') - block.count(b'\r\n')
+            if last.endswith(b'\r') and block.startswith(b'\n'):
+                count -= 1
+            last = block
+    if last and not last.endswith((b'\n', b'\r')):
+        count += 1
+    return count
+
+def _iter_lowered_lines(f):
+    """
+    Yield lines of a text file opened with newline='', lowercasing a whole
+    block at a time. Lines end at \r\n, \r or \n and keep their terminator.
+    """
+    tail = ''
+    for block in iter(lambda: f.read(READ_BLOCK_SIZE), ''):
+        text = tail + block.lower()
+        if '\r' not in text:
+            lines = text.split('\n')
+            tail = lines.pop()
+            for line in lines:
+                yield line + '\n'
+            continue
+        
+        # A trailing \r waits for the next block, which may start with its \n
+        end = len(text) - 1 if text.endswith('\r') else len(text)
+        pos = 0
+        for match in LINE_PATTERN.finditer(text, 0, end):
+            yield match.group()
+            pos = match.end()
+        tail = text[pos:]
+    if tail:
+        yield tail
+
+def _iter_email_chunks(file_path, chunk_size):
+    """Stream normalized candidate emails from a CSV file in chunks"""
+    chunk = []
+    with open(file_path, 'r', encoding='utf-8', errors='ignore', newline='') as f:
+        lines = _iter_lowered_lines(f)
+        for line in lines:
+            # Unquoted lines (the usual single-column upload) are split
+            # directly; only quoted records go through csv.reader, which may
+            # pull continuation lines of a multi-line field from the same iterator
+            if '"' in line:
+                row = next(csv.reader(chain((line,), lines)), None)
+                email = row[0].strip() if row else ''
+            else:
+                email = line.split(',', 1)[0].strip()
+            if email and '@' in email:
+                chunk.append(email)
+                if len(chunk) >= chunk_size:
+                    yield chunk
+                    chunk = []
+    if chunk:
+        yield chunk
+
+def _flush_import_rows(pending_emails, pending_rejects, pending_guest_items, pending_guest_emails=()):
+    """Bulk insert accumulated import rows and clear the buffers"""
+    if pending_guest_emails:
+        # Guests' new emails are inserted in one batch with RETURNING, and the
+        # ids are linked to their guest items before those are written
+        table = Email.__table__
+        email_ids = db.session.execute(
+            table.insert().returning(table.c.id, sort_by_parameter_order=True),
+            [email_row for email_row, _ in pending_guest_emails]
+        ).scalars().all()
+        for (_, guest_item), email_id in zip(pending_guest_emails, email_ids):
+            guest_item['matched_email_id'] = email_id
+        pending_guest_emails.clear()
+    if pending_rejects:
+        _bulk_insert(RejectedEmail, [dict(zip(REJECTED_COLUMNS, row)) for row in pending_rejects])
+        pending_rejects.clear()
+    for model, rows in ((Email, pending_emails), (GuestEmailItem, pending_guest_items)):
+        if rows:
+            _bulk_insert(model, rows)
+            rows.clear()
+
+def _defer_commit_sync():
+    """
+    Let the current transaction commit without waiting for the WAL flush.
+    Imported rows can be rebuilt from the uploaded file, so a crash costs at
+    most a re-import. SET LOCAL ends with the transaction, leaving the final
+    job completion commit fully durable.
+    """
+    if db.engine.dialect.name == 'postgresql':
+        db.session.execute(text('SET LOCAL synchronous_commit = off'))
+
+def _bulk_insert(model, rows):
+    """
+    Insert plain-dict rows, using COPY on PostgreSQL for larger batches and
+    a Core executemany otherwise.
+    """
+    if db.engine.dialect.name == 'postgresql' and len(rows) > COPY_MIN_ROWS:
+        _copy_rows(model.__table__, rows)
+    else:
+        # executemany binds every row against the first row's keys, so rows
+        # missing an optional column (e.g. rejected guest items) get None
+        keys = set().union(*rows)
+        if any(len(row) != len(keys) for row in rows):
+            rows = [{key: row.get(key) for key in keys} for row in rows]
+        db.session.execute(model.__table__.insert(), rows)
+
+def _copy_value(value):
+    """Format a value for PostgreSQL COPY text format"""
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    return (str(value).replace('\\', '\\\\').replace('\t', '\\t')
+            .replace('\n', '\\n').replace('\r', '\\r'))
+
+def _copy_rows(table, rows):
+    """Stream rows into a table with COPY FROM STDIN inside the session's transaction"""
+    keys = set().union(*rows)
+    
+    # COPY bypasses SQLAlchemy, so Python-side column defaults are filled in here
+    columns = []
+    defaults = {}
+    for column in table.columns:
+        if column.primary_key:
+            continue
+        if column.key in keys:
+            columns.append(column.key)
+        elif column.default is not None:
+            columns.append(column.key)
+            default = column.default
+            defaults[column.key] = default.arg(None) if default.is_callable else default.arg
+    
+    buf = io.StringIO()
+    for row in rows:
+        buf.write('\t'.join(_copy_value(row.get(name, defaults.get(name))) for name in columns))
+        buf.write('\n')
+    buf.seek(0)
+    
+    statement = f'COPY {table.name} ({", ".join(columns)}) FROM STDIN'
+    dbapi = db.engine.dialect.dbapi
+    cursor = db.session.connection().connection.cursor()
+    try:
+        cursor.copy_expert(statement, buf)
+    except dbapi.Error as e:
+        # Raised like any other statement's failure, so callers handling
+        # SQLAlchemyError (e.g. the import's per-chunk savepoint) see it
+        raise DBAPIError.instance(statement, None, e, dbapi.Error) from e
+    finally:
+        cursor.close()
 
 @shared_task(bind=True)
 def validate_emails_task(self, batch_id, user_id, check_dns=False, check_role=False, check_disposable=True, 
@@ -323,304 +625,466 @@ def validate_emails_task(self, batch_id, user_id, check_dns=False, check_role=Fa
         filter_domains: Comma-separated list of domains to filter
         use_smtp: Whether to use SMTP verification (requires SMTP servers configured)
     """
-    from app import create_app
     from app.models.job import SMTPConfig
     from app.utils.email_validator import verify_email_smtp
     from concurrent.futures import ThreadPoolExecutor, as_completed
     from datetime import datetime as dt
     
-    app = create_app()
-    
-    with app.app_context():
-        try:
-            # Get or create job record
-            job = Job.query.filter_by(job_id=self.request.id).first()
-            if not job:
-                job = Job(
-                    job_id=self.request.id,
-                    job_type='validate',
-                    user_id=user_id,
+    job = None
+    try:
+        # Get or create job record
+        job = Job.query.filter_by(job_id=self.request.id).first()
+        if not job:
+            job = Job(
+                job_id=self.request.id,
+                job_type='validate',
+                user_id=user_id,
+                batch_id=batch_id,
+                status='running'
+            )
+            db.session.add(job)
+            db.session.commit()
+        
+        job.status = 'running'
+        job.started_at = datetime.utcnow()
+        db.session.commit()
+        
+        # Check if user is guest
+        user = User.query.get(user_id)
+        is_guest = user.is_guest() if user else False
+        
+        # Check SMTP permission for guests
+        if use_smtp and is_guest and not (user and user.smtp_verification_allowed):
+            raise Exception('Guest user does not have SMTP verification permission')
+        
+        # Get SMTP servers if use_smtp is enabled
+        smtp_servers = []
+        if use_smtp:
+            smtp_configs = SMTPConfig.query.filter_by(is_active=True).order_by(
+                SMTPConfig.last_used_at.asc().nullsfirst()
+            ).all()
+            
+            if not smtp_configs:
+                # Fallback to DNS validation if no SMTP servers
+                print(f"[SMTP] WARNING: No active SMTP servers configured. Falling back to DNS validation.")
+                use_smtp = False
+                check_dns = True
+            else:
+                smtp_servers = smtp_configs
+                # Get thread count from first config (they should all have same setting)
+                thread_count = smtp_configs[0].thread_count if smtp_configs else 5
+                print(f"[SMTP] Found {len(smtp_servers)} active SMTP server(s), thread_count={thread_count}")
+        
+        # Get ignore domains
+        ignore_domains = _load_ignore_domains()
+        
+        # Build filter for domains if provided
+        domain_filter = None
+        if filter_domains:
+            domain_filter = {d.strip() for d in filter_domains.split(',') if d.strip()}
+        
+        # For guest users, get emails via their guest items
+        # For regular users, get emails directly
+        if is_guest:
+            if validate_all_unverified:
+                # Get all unverified emails for guest
+                guest_items = GuestEmailItem.query.filter_by(user_id=user_id)
+            elif batch_id:
+                # Get guest items from specific batch
+                guest_items = GuestEmailItem.query.filter_by(
                     batch_id=batch_id,
-                    status='running'
+                    user_id=user_id
                 )
-                db.session.add(job)
-                db.session.commit()
-            
-            job.status = 'running'
-            job.started_at = datetime.utcnow()
-            db.session.commit()
-            
-            # Check if user is guest
-            user = User.query.get(user_id)
-            is_guest = user.is_guest() if user else False
-            
-            # Check SMTP permission for guests
-            if use_smtp and is_guest and not (user and user.smtp_verification_allowed):
-                raise Exception('Guest user does not have SMTP verification permission')
-            
-            # Get SMTP servers if use_smtp is enabled
-            smtp_servers = []
-            if use_smtp:
-                smtp_configs = SMTPConfig.query.filter_by(is_active=True).order_by(
-                    SMTPConfig.last_used_at.asc().nullsfirst()
-                ).all()
-                
-                if not smtp_configs:
-                    # Fallback to DNS validation if no SMTP servers
-                    print(f"[SMTP] WARNING: No active SMTP servers configured. Falling back to DNS validation.")
-                    use_smtp = False
-                    check_dns = True
-                else:
-                    smtp_servers = smtp_configs
-                    # Get thread count from first config (they should all have same setting)
-                    thread_count = smtp_configs[0].thread_count if smtp_configs else 5
-                    print(f"[SMTP] Found {len(smtp_servers)} active SMTP server(s), thread_count={thread_count}")
-            
-            # Get ignore domains
-            ignore_domains = [d.domain for d in IgnoreDomain.query.all()]
-            
-            # Build filter for domains if provided
-            domain_filter = None
-            if filter_domains:
-                domain_filter = [d.strip() for d in filter_domains.split(',') if d.strip()]
-            
-            # For guest users, get emails via their guest items
-            # For regular users, get emails directly
-            if is_guest:
-                if validate_all_unverified:
-                    # Get all unverified emails for guest
-                    guest_items = GuestEmailItem.query.filter_by(
-                        user_id=user_id
-                    ).filter(
-                        GuestEmailItem.matched_email_id.isnot(None)
-                    ).all()
-                elif batch_id:
-                    # Get guest items from specific batch
-                    guest_items = GuestEmailItem.query.filter_by(
-                        batch_id=batch_id,
-                        user_id=user_id
-                    ).filter(
-                        GuestEmailItem.matched_email_id.isnot(None)
-                    ).all()
-                else:
-                    raise Exception('Either batch_id or validate_all_unverified must be specified')
-                
-                # Get unique emails to validate
-                emails_to_validate = []
-                seen_email_ids = set()
-                
-                for item in guest_items:
-                    if item.matched_email_id and item.matched_email_id not in seen_email_ids:
-                        email_obj = item.matched_email
-                        if email_obj and not email_obj.is_validated:
-                            # Apply domain filter if specified
-                            if domain_filter:
-                                if email_obj.domain in domain_filter or (email_obj.domain_category == 'mixed' and 'mixed' in domain_filter):
-                                    seen_email_ids.add(item.matched_email_id)
-                                    emails_to_validate.append(email_obj)
-                            else:
-                                seen_email_ids.add(item.matched_email_id)
-                                emails_to_validate.append(email_obj)
-                
-                emails = emails_to_validate
             else:
-                # Regular user
-                if validate_all_unverified:
-                    # Get all unverified emails for user
-                    query = Email.query.filter_by(uploaded_by=user_id, is_validated=False)
-                elif batch_id:
-                    batch = Batch.query.get(batch_id)
-                    if not batch:
-                        raise Exception(f'Batch {batch_id} not found')
-                    # Get unverified emails from batch
-                    query = Email.query.filter_by(batch_id=batch_id, is_validated=False)
-                else:
-                    raise Exception('Either batch_id or validate_all_unverified must be specified')
+                raise Exception('Either batch_id or validate_all_unverified must be specified')
+            
+            # Select the linked emails in SQL rather than loading every guest
+            # item and its email; IN also removes emails linked more than once
+            matched_ids = guest_items.filter(
+                GuestEmailItem.matched_email_id.isnot(None)
+            ).with_entities(GuestEmailItem.matched_email_id)
+            query = Email.query.filter(Email.id.in_(matched_ids.statement), Email.is_validated.is_(False))
+        else:
+            # Regular user
+            if validate_all_unverified:
+                # Get all unverified emails for user
+                query = Email.query.filter_by(uploaded_by=user_id, is_validated=False)
+            elif batch_id:
+                batch = Batch.query.get(batch_id)
+                if not batch:
+                    raise Exception(f'Batch {batch_id} not found')
+                # Get unverified emails from batch
+                query = Email.query.filter_by(batch_id=batch_id, is_validated=False)
+            else:
+                raise Exception('Either batch_id or validate_all_unverified must be specified')
+        
+        # Apply domain filter if specified
+        if domain_filter:
+            # Filter by specific domains or mixed category, with one IN list
+            # rather than an OR of one equality per domain
+            from sqlalchemy import or_
+            domain_conditions = []
+            domains = sorted(domain_filter - {'mixed'})
+            if domains:
+                domain_conditions.append(Email.domain.in_(domains))
+            if 'mixed' in domain_filter:
+                domain_conditions.append(Email.domain_category == 'mixed')
+            query = query.filter(or_(*domain_conditions))
+        
+        # Only SMTP validation needs ORM objects; other paths page through
+        # (id, email, domain) rows and write results back in bulk
+        emails = query.all() if use_smtp and smtp_servers else None
+        
+        job.total = len(emails) if emails is not None else query.count()
+        db.session.commit()
+        
+        valid_count = 0
+        invalid_count = 0
+        local_errors = 0
+        chunk_size = current_app.config.get('VALIDATION_CHUNK_SIZE', 5000)
+        
+        if use_smtp and smtp_servers:
+            # Log SMTP validation start
+            print(f"[SMTP] Using SMTP verification with {len(smtp_servers)} server(s), {thread_count} thread(s)")
+            print(f"[SMTP] Server list: {[f'{s.smtp_host}:{s.smtp_port}' for s in smtp_servers]}")
+            
+            # Worker threads have no app context or session, so they get plain
+            # values read here; ORM objects are only touched on this thread
+            server_settings = [
+                (s.smtp_host, s.smtp_port, s.smtp_username, s.smtp_password,
+                 s.use_tls, s.use_ssl, s.timeout or 30, s.from_email)
+                for s in smtp_servers
+            ]
+            # One SELECT reloads the emails expired by the commit above
+            emails = query.all()
+            addresses = [email_obj.email for email_obj in emails]
+            
+            # SMTP validation with threading and rotation
+            def validate_with_smtp(idx):
+                """Validate single email using SMTP"""
+                address = addresses[idx]
+                host, port, username, password, use_tls, use_ssl, timeout, from_email = \
+                    server_settings[idx % len(server_settings)]
                 
-                # Apply domain filter if specified
-                if domain_filter:
-                    # Filter by specific domains or mixed category
-                    domain_conditions = []
-                    for domain in domain_filter:
-                        if domain == 'mixed':
-                            domain_conditions.append(Email.domain_category == 'mixed')
-                        else:
-                            domain_conditions.append(Email.domain == domain)
-                    
-                    if domain_conditions:
-                        from sqlalchemy import or_
-                        query = query.filter(or_(*domain_conditions))
+                print(f"[SMTP] Validating {address} using {host}:{port}")
                 
-                emails = query.all()
-            
-            job.total = len(emails)
-            db.session.commit()
-            
-            valid_count = 0
-            invalid_count = 0
-            
-            from app.utils.email_validator import validate_email_enhanced
-            
-            if use_smtp and smtp_servers:
-                # Log SMTP validation start
-                print(f"[SMTP] Using SMTP verification with {len(smtp_servers)} server(s), {thread_count} thread(s)")
-                print(f"[SMTP] Server list: {[f'{s.smtp_host}:{s.smtp_port}' for s in smtp_servers]}")
+                is_valid, error_code, error_message = verify_email_smtp(
+                    address,
+                    host,
+                    port,
+                    username,
+                    password,
+                    use_tls=use_tls,
+                    use_ssl=use_ssl,
+                    timeout=timeout,
+                    from_email=from_email
+                )
                 
-                # SMTP validation with threading and rotation
-                def validate_with_smtp(email_obj, smtp_server_idx):
-                    """Validate single email using SMTP"""
-                    smtp_server = smtp_servers[smtp_server_idx % len(smtp_servers)]
-                    server_name = f"{smtp_server.smtp_host}:{smtp_server.smtp_port}"
-                    
-                    print(f"[SMTP] Validating {email_obj.email} using {server_name}")
-                    
-                    is_valid, error_code, error_message = verify_email_smtp(
-                        email_obj.email,
-                        smtp_server.smtp_host,
-                        smtp_server.smtp_port,
-                        smtp_server.smtp_username,
-                        smtp_server.smtp_password,
-                        use_tls=smtp_server.use_tls,
-                        use_ssl=smtp_server.use_ssl,
-                        timeout=smtp_server.timeout or 30,
-                        from_email=smtp_server.from_email
-                    )
-                    
-                    # Log result
-                    result_str = "VALID" if is_valid else f"INVALID ({error_message})"
-                    print(f"[SMTP] Email validated: {email_obj.email} - Result: {result_str}")
-                    
-                    # Update last used timestamp for rotation
-                    smtp_server.last_used_at = dt.utcnow()
-                    
-                    return email_obj, is_valid, error_code, error_message
+                # Log result
+                result_str = "VALID" if is_valid else f"INVALID ({error_message})"
+                print(f"[SMTP] Email validated: {address} - Result: {result_str}")
                 
-                # Use ThreadPoolExecutor for concurrent SMTP validation
-                print(f"[SMTP] Starting concurrent validation with thread pool (max_workers={thread_count})")
-                with ThreadPoolExecutor(max_workers=thread_count) as executor:
-                    futures = []
-                    for idx, email_obj in enumerate(emails):
-                        # Round-robin server selection
-                        future = executor.submit(validate_with_smtp, email_obj, idx)
-                        futures.append(future)
-                    
-                    # Process results as they complete
-                    completed = 0
-                    for future in as_completed(futures):
-                        try:
-                            email_obj, is_valid, error_code, error_message = future.result()
-                            
-                            email_obj.is_validated = True
-                            email_obj.is_valid = is_valid
-                            email_obj.quality_score = 100 if is_valid else 0
-                            email_obj.validation_method = 'smtp'  # Mark as SMTP validated
-                            
-                            if not is_valid:
-                                email_obj.validation_error = f'SMTP: {error_message}' if error_message else 'Invalid'
-                                invalid_count += 1
-                            else:
-                                valid_count += 1
-                            
-                            completed += 1
-                            
-                            # Update progress every 50 emails
-                            if completed % 50 == 0:
-                                print(f"[SMTP] Progress: {completed}/{job.total} emails validated ({valid_count} valid, {invalid_count} invalid)")
-                                job.update_progress(completed)
-                                db.session.commit()
-                                
-                                self.update_state(
-                                    state='PROGRESS',
-                                    meta={
-                                        'current': completed,
-                                        'total': job.total,
-                                        'percent': job.progress_percent
-                                    }
-                                )
-                        except Exception as e:
-                            job.errors += 1
-                            print(f"[SMTP] ERROR: Validation error - {str(e)}")
+                return idx, is_valid, error_code, error_message
+            
+            # Use ThreadPoolExecutor for concurrent SMTP validation
+            print(f"[SMTP] Starting concurrent validation with thread pool (max_workers={thread_count})")
+            progress_due = progress_throttle(current_app.config.get('PROGRESS_REPORT_INTERVAL', 1.0))
+            progress_meta = {'current': 0, 'total': job.total, 'percent': 0.0}
+            with ThreadPoolExecutor(max_workers=thread_count) as executor:
+                # Round-robin server selection by index
+                futures = [executor.submit(validate_with_smtp, idx) for idx in range(len(emails))]
                 
-                # Update SMTP server timestamps
-                db.session.commit()
-                print(f"[SMTP] SMTP validation completed: {valid_count} valid, {invalid_count} invalid out of {len(emails)} total")
-            else:
-                # Standard validation (DNS/MX)
-                for idx, email_obj in enumerate(emails):
+                # Process results as they complete
+                completed = 0
+                for future in as_completed(futures):
                     try:
-                        # Enhanced validation with quality scoring
-                        is_valid, error_type, error_message, quality_score, details = validate_email_enhanced(
-                            email_obj.email,
-                            check_dns=check_dns,
-                            check_smtp=False,  # SMTP check is slow, keep disabled
-                            check_role=check_role,
-                            check_disposable=check_disposable,
-                            ignore_domains=ignore_domains
-                        )
+                        idx, is_valid, error_code, error_message = future.result()
+                        email_obj = emails[idx]
+                        
+                        # Update last used timestamp for rotation
+                        smtp_servers[idx % len(smtp_servers)].last_used_at = dt.utcnow()
                         
                         email_obj.is_validated = True
                         email_obj.is_valid = is_valid
-                        email_obj.quality_score = quality_score
+                        email_obj.quality_score = 100 if is_valid else 0
+                        email_obj.validation_method = 'smtp'  # Mark as SMTP validated
                         
                         if not is_valid:
-                            email_obj.validation_error = f'{error_type}: {error_message}'
+                            email_obj.validation_error = f'SMTP: {error_message}' if error_message else 'Invalid'
                             invalid_count += 1
                         else:
                             valid_count += 1
                         
-                        # Update progress every 50 emails
-                        if (idx + 1) % 50 == 0:
-                            job.update_progress(idx + 1)
-                            db.session.commit()
+                        completed += 1
+                        
+                        # Update progress at most once per report interval; live
+                        # progress goes to Redis like the other validation paths
+                        if completed % 50 == 0 and progress_due():
+                            print(f"[SMTP] Progress: {completed}/{job.total} emails validated ({valid_count} valid, {invalid_count} invalid)")
+                            job.update_progress(completed)
+                            publish_progress(job.job_id, completed, job.total, job.errors + local_errors)
                             
-                            self.update_state(
-                                state='PROGRESS',
-                                meta={
-                                    'current': idx + 1,
-                                    'total': job.total,
-                                    'percent': job.progress_percent
-                                }
-                            )
-                    
+                            progress_meta['current'] = completed
+                            progress_meta['percent'] = job.progress_percent
+                            self.update_state(state='PROGRESS', meta=progress_meta)
                     except Exception as e:
-                        job.errors += 1
-                        email_obj.is_validated = True
-                        email_obj.is_valid = False
-                        email_obj.validation_error = f'Validation error: {str(e)}'
-                        email_obj.quality_score = 0
-                        invalid_count += 1
+                        local_errors += 1
+                        print(f"[SMTP] ERROR: Validation error - {str(e)}")
             
-            # Final commit
+            # Update SMTP server timestamps
             db.session.commit()
-            
-            # Update batch statistics if batch_id provided
-            if batch_id:
-                batch = Batch.query.get(batch_id)
-                if batch:
-                    batch.valid_count = Email.query.filter_by(batch_id=batch_id, is_validated=True, is_valid=True).count()
-                    batch.invalid_count = Email.query.filter_by(batch_id=batch_id, is_validated=True, is_valid=False).count()
-                    batch.status = 'validated'
-                    db.session.commit()
-            
-            # Complete job
-            job.complete(
-                message=f'Validated {valid_count} valid, {invalid_count} invalid emails',
-                result_data={
-                    'valid': valid_count,
-                    'invalid': invalid_count
-                }
+            print(f"[SMTP] SMTP validation completed: {valid_count} valid, {invalid_count} invalid out of {len(emails)} total")
+        elif job.total > chunk_size:
+            # Split large runs into sub-tasks that validate in parallel across
+            # workers; finalize_validation_task completes the job and batch
+            email_ids = [row.id for row in query.with_entities(Email.id)]
+            header = group(
+                validate_chunk_task.s(
+                    email_ids[i:i + chunk_size], self.request.id,
+                    check_dns, check_role, check_disposable
+                )
+                for i in range(0, len(email_ids), chunk_size)
+            )
+            # A failed chunk never reaches finalize, so the error callback
+            # marks the job failed instead of leaving it running
+            chord(header)(
+                finalize_validation_task.s(self.request.id, batch_id)
+                .on_error(fail_validation_task.s(self.request.id))
             )
             
             return {
-                'status': 'completed',
+                'status': 'dispatched',
+                'chunks': len(header.tasks)
+            }
+        else:
+            # Standard validation (DNS/MX). Each page's results are committed;
+            # live progress goes to Redis at most once per PROGRESS_REPORT_INTERVAL
+            # and the job row is updated every PROGRESS_COMMIT_INTERVAL emails
+            commit_interval = current_app.config.get('PROGRESS_COMMIT_INTERVAL', 10000)
+            progress_due = progress_throttle(current_app.config.get('PROGRESS_REPORT_INTERVAL', 1.0))
+            progress_meta = {'current': 0, 'total': job.total, 'percent': 0.0}
+            page_size = current_app.config.get('VALIDATION_PAGE_SIZE', VALIDATION_PAGE_SIZE)
+            
+            def report_progress(processed):
+                if processed // commit_interval != job.processed // commit_interval:
+                    job.update_progress(processed)
+                else:
+                    db.session.commit()
+                if not progress_due():
+                    return
+                publish_progress(job.job_id, processed, job.total, job.errors + local_errors)
+                progress_meta['current'] = processed
+                progress_meta['percent'] = processed / job.total * 100 if job.total else 0.0
+                self.update_state(state='PROGRESS', meta=progress_meta)
+            
+            processed = 0
+            mx_cache = {}
+            for page in _iter_email_pages(query, page_size):
+                page_valid, page_invalid, page_errors = _validate_rows(
+                    page, check_dns, check_role, check_disposable, ignore_domains, mx_cache
+                )
+                valid_count += page_valid
+                invalid_count += page_invalid
+                local_errors += page_errors
+                processed += len(page)
+                report_progress(processed)
+        
+        # Add this run's error count atomically rather than read-modify-write
+        if local_errors:
+            db.session.execute(
+                update(Job).where(Job.id == job.id).values(errors=Job.errors + local_errors)
+            )
+        
+        # Final commit
+        db.session.commit()
+        
+        # Update batch statistics if batch_id provided
+        if batch_id:
+            _update_validated_batch(batch_id)
+        
+        # Complete job
+        job.complete(
+            message=f'Validated {valid_count} valid, {invalid_count} invalid emails',
+            result_data={
                 'valid': valid_count,
                 'invalid': invalid_count
             }
+        )
+        
+        return {
+            'status': 'completed',
+            'valid': valid_count,
+            'invalid': invalid_count
+        }
+        
+    except Exception as e:
+        # Discard the failed transaction so the failure itself can be recorded
+        db.session.rollback()
+        if job:
+            job.fail(str(e))
+        raise
+
+
+def _iter_email_pages(query, page_size):
+    """
+    Page through (id, email, domain) rows of an Email query by ascending id.
+    Keyset paging keeps each page a short query, so results can be
+    committed between pages without holding a cursor open.
+    """
+    rows_query = query.with_entities(Email.id, Email.email, Email.domain).order_by(Email.id)
+    last_id = 0
+    while True:
+        page = rows_query.filter(Email.id > last_id).limit(page_size).all()
+        if not page:
+            return
+        yield page
+        last_id = page[-1].id
+
+def _validate_rows(rows, check_dns, check_role, check_disposable, ignore_domains, mx_cache=None):
+    """
+    Run enhanced (non-SMTP) validation over (id, email, domain) rows and
+    write the results with one bulk UPDATE.
+    Returns (valid_count, invalid_count, error_count)
+    """
+    from app.utils.email_validator import validate_email_enhanced
+    
+    # Resolve MX once per distinct domain, concurrently, rather than
+    # one blocking lookup per email
+    mx_results = None
+    if check_dns:
+        mx_results = mx_cache if mx_cache is not None else {}
+        unresolved = {domain for _, _, domain in rows if domain and domain not in mx_results}
+        if unresolved:
+            mx_results.update(resolve_mx_bulk(
+                unresolved,
+                concurrency=current_app.config.get('DNS_CONCURRENCY', 200)
+            ))
+    
+    valid_count = 0
+    invalid_count = 0
+    error_count = 0
+    updates = []
+    
+    for email_id, email, _ in rows:
+        try:
+            # Enhanced validation with quality scoring
+            is_valid, error_type, error_message, quality_score, details = validate_email_enhanced(
+                email,
+                check_dns=check_dns,
+                check_smtp=False,  # SMTP check is slow, keep disabled
+                check_role=check_role,
+                check_disposable=check_disposable,
+                ignore_domains=ignore_domains,
+                mx_results=mx_results
+            )
             
+            if not is_valid:
+                validation_error = f'{error_type}: {error_message}'
+                invalid_count += 1
+            else:
+                validation_error = None
+                valid_count += 1
+        
         except Exception as e:
-            if job:
-                job.fail(str(e))
-            raise
+            error_count += 1
+            is_valid = False
+            validation_error = f'Validation error: {str(e)}'
+            quality_score = 0
+            invalid_count += 1
+        
+        updates.append({
+            'id': email_id,
+            'is_validated': True,
+            'is_valid': is_valid,
+            'quality_score': quality_score,
+            'validation_error': validation_error
+        })
+    
+    db.session.bulk_update_mappings(Email, updates)
+    
+    return valid_count, invalid_count, error_count
+
+def _update_validated_batch(batch_id):
+    """Recount a batch's valid/invalid emails and mark it validated"""
+    batch = Batch.query.get(batch_id)
+    if batch:
+        batch.valid_count = Email.query.filter_by(batch_id=batch_id, is_validated=True, is_valid=True).count()
+        batch.invalid_count = Email.query.filter_by(batch_id=batch_id, is_validated=True, is_valid=False).count()
+        batch.status = 'validated'
+        db.session.commit()
+
+@shared_task
+def validate_chunk_task(email_ids, parent_job_id, check_dns=False, check_role=False, check_disposable=True):
+    """
+    Validate one slice of a large validation run.
+    Returns per-chunk counters for finalize_validation_task.
+    """
+    ignore_domains = _load_ignore_domains()
+    rows = Email.query.filter(Email.id.in_(email_ids)).with_entities(
+        Email.id, Email.email, Email.domain
+    ).all()
+    
+    valid_count, invalid_count, error_count = _validate_rows(
+        rows, check_dns, check_role, check_disposable, ignore_domains
+    )
+    
+    # Advance the parent job's progress atomically; chunks finish concurrently
+    processed = Job.processed + len(rows)
+    db.session.execute(
+        update(Job).where(Job.job_id == parent_job_id).values(
+            processed=processed,
+            errors=Job.errors + error_count,
+            progress_percent=processed * 100.0 / Job.total
+        )
+    )
+    db.session.commit()
+    
+    return {
+        'valid': valid_count,
+        'invalid': invalid_count,
+        'errors': error_count
+    }
+
+@shared_task
+def finalize_validation_task(chunk_results, job_id, batch_id=None):
+    """Sum chunk counters, update batch statistics and complete the parent job"""
+    job = Job.query.filter_by(job_id=job_id).first()
+    
+    valid_count = sum(r['valid'] for r in chunk_results)
+    invalid_count = sum(r['invalid'] for r in chunk_results)
+    
+    try:
+        if batch_id:
+            _update_validated_batch(batch_id)
+        
+        job.complete(
+            message=f'Validated {valid_count} valid, {invalid_count} invalid emails',
+            result_data={
+                'valid': valid_count,
+                'invalid': invalid_count
+            }
+        )
+    except Exception as e:
+        # Discard the failed transaction so the failure itself can be recorded
+        db.session.rollback()
+        if job:
+            job.fail(str(e))
+        raise
+    
+    return {
+        'status': 'completed',
+        'valid': valid_count,
+        'invalid': invalid_count
+    }
+
+@shared_task
+def fail_validation_task(request, exc, traceback, job_id):
+    """Error callback of a chunked validation run: mark the parent job failed"""
+    # Discard whatever transaction the failed chunk left behind
+    db.session.rollback()
+    job = Job.query.filter_by(job_id=job_id).first()
+    if job:
+        job.fail(str(exc))
 
 @shared_task(bind=True)
 def export_emails_task(self, user_id, export_type='verified', batch_id=None, filter_domains=None, 
@@ -642,297 +1106,346 @@ def export_emails_task(self, user_id, export_type='verified', batch_id=None, fil
         custom_fields: List of fields to export (for CSV)
         random_limit: Optional limit to random sample of N emails
     """
-    from app import create_app
-    app = create_app()
-    
-    with app.app_context():
-        try:
-            # Get or create job record
-            job = Job.query.filter_by(job_id=self.request.id).first()
-            if not job:
-                job = Job(
-                    job_id=self.request.id,
-                    job_type='export',
-                    user_id=user_id,
-                    batch_id=batch_id,
-                    status='running'
-                )
-                db.session.add(job)
-                db.session.commit()
-            
-            job.status = 'running'
-            job.started_at = datetime.utcnow()
-            db.session.commit()
-            
-            # Build base query
-            query = Email.query
-            
-            if batch_id:
-                query = query.filter_by(batch_id=batch_id)
-            
-            if export_type == 'verified':
-                query = query.filter_by(is_validated=True, is_valid=True)
-            elif export_type == 'smtp_verified':
-                query = query.filter_by(is_validated=True, is_valid=True, validation_method='smtp')
-            elif export_type == 'unverified':
-                query = query.filter_by(is_validated=False)
-            elif export_type == 'invalid':
-                query = query.filter_by(is_validated=True, is_valid=False)
-            # 'all' exports everything
-            
-            # Get suppression list
-            suppressed = set([s.email for s in SuppressionList.query.all()])
-            
-            # Collect emails by domain if domain_limits specified
-            emails_to_export = []
-            
-            if domain_limits:
-                # Export specific domains with limits
-                for domain, limit in domain_limits.items():
-                    domain_query = query.filter_by(domain=domain)
-                    domain_emails = domain_query.limit(limit).all()
-                    emails_to_export.extend(domain_emails)
-            elif filter_domains:
-                # Export all from specified domains (backward compatibility)
-                query = query.filter(Email.domain.in_(filter_domains))
-                emails_to_export = query.all()
-            else:
-                # Export all matching query
-                # If random_limit is specified, use random sampling
-                if random_limit and random_limit > 0:
-                    from sqlalchemy import func
-                    total_count = query.count()
-                    if total_count > random_limit:
-                        # Use ORDER BY RANDOM() with LIMIT for random sampling
-                        emails_to_export = query.order_by(func.random()).limit(random_limit).all()
-                    else:
-                        emails_to_export = query.all()
-                else:
-                    emails_to_export = query.all()
-            
-            job.total = len(emails_to_export)
+    job = None
+    try:
+        # Get or create job record
+        job = Job.query.filter_by(job_id=self.request.id).first()
+        if not job:
+            job = Job(
+                job_id=self.request.id,
+                job_type='export',
+                user_id=user_id,
+                batch_id=batch_id,
+                status='running'
+            )
+            db.session.add(job)
             db.session.commit()
-            
-            # Create export folder
-            export_folder = app.config['EXPORT_FOLDER']
-            os.makedirs(export_folder, exist_ok=True)
-            
-            timestamp = datetime.utcnow().strftime('%Y%m%d_%H%M%S')
-            
-            # Determine fields to export
-            if custom_fields:
-                fields = custom_fields
-            else:
-                if export_format == 'txt':
-                    fields = ['email']
-                else:
-                    fields = ['email', 'domain', 'quality_score', 'uploaded_at']
-            
-            # Export emails
-            exported_count = 0
-            file_paths = []
-            file_number = 1
-            file_counts = []  # Track count per file
-            
-            if split_files and len(emails_to_export) > split_size:
-                # Split into multiple files
-                for i in range(0, len(emails_to_export), split_size):
-                    chunk = emails_to_export[i:i + split_size]
-                    ext = 'txt' if export_format == 'txt' else 'csv'
-                    filename = f"export_{export_type}_{user_id}_{timestamp}_part{file_number}.{ext}"
-                    file_path = os.path.join(export_folder, filename)
-                    file_paths.append((filename, file_path))
-                    
-                    chunk_count = _write_export_file(chunk, file_path, fields, export_format, suppressed)
-                    file_counts.append(chunk_count)
-                    exported_count += chunk_count
-                    file_number += 1
-                    
-                    # Update progress
-                    job.update_progress(min(i + split_size, len(emails_to_export)))
-                    db.session.commit()
+        
+        job.status = 'running'
+        started_at = datetime.utcnow()
+        job.started_at = started_at
+        db.session.commit()
+        
+        # Build base query
+        query = Email.query
+        
+        if batch_id:
+            query = query.filter_by(batch_id=batch_id)
+        
+        if export_type == 'verified':
+            query = query.filter_by(is_validated=True, is_valid=True)
+        elif export_type == 'smtp_verified':
+            query = query.filter_by(is_validated=True, is_valid=True, validation_method='smtp')
+        elif export_type == 'unverified':
+            query = query.filter_by(is_validated=False)
+        elif export_type == 'invalid':
+            query = query.filter_by(is_validated=True, is_valid=False)
+        # 'all' exports everything
+        
+        # Leave out suppressed emails in SQL rather than loading the whole
+        # suppression list into memory
+        query = query.filter(~exists().where(SuppressionList.email == Email.email))
+        
+        # Determine fields to export
+        if custom_fields:
+            fields = custom_fields
+        else:
+            if export_format == 'txt':
+                fields = ['email']
             else:
-                # Single file export
-                ext = 'txt' if export_format == 'txt' else 'csv'
-                filename = f"export_{export_type}_{user_id}_{timestamp}.{ext}"
-                file_path = os.path.join(export_folder, filename)
-                file_paths.append((filename, file_path))
-                
-                exported_count = _write_export_file(
-                    emails_to_export, file_path, fields, export_format, suppressed, job, self
-                )
-                file_counts.append(exported_count)
-            
-            # Mark emails as downloaded
-            for email_obj in emails_to_export:
-                if email_obj.email not in suppressed:
-                    email_obj.downloaded = True
-                    email_obj.download_count += 1
-            db.session.commit()
-            
-            # If split files, create ZIP archive
-            final_file_path = None
-            final_filename = None
-            final_file_size = 0
-            
-            if split_files and len(file_paths) > 1:
-                # Create ZIP file containing all parts
-                zip_filename = f"export_{export_type}_{user_id}_{timestamp}.zip"
-                zip_path = os.path.join(export_folder, zip_filename)
-                
-                with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                    for filename, file_path in file_paths:
-                        zipf.write(file_path, filename)
-                        # Delete individual files after adding to ZIP
-                        try:
-                            os.remove(file_path)
-                        except:
-                            pass
-                
-                final_file_path = zip_path
-                final_filename = zip_filename
-                final_file_size = os.path.getsize(zip_path)
+                fields = ['email', 'domain', 'quality_score', 'uploaded_at']
+        
+        # Stream plain column tuples instead of loading every Email object;
+        # only the columns needed for the export fields are selected
+        column_names = ['id', 'email'] + [field for field in fields if field in Email.__table__.c]
+        export_query = query.with_entities(
+            *(getattr(Email, name) for name in dict.fromkeys(column_names))
+        )
+        
+        if domain_limits:
+            # Export specific domains with limits: rank each domain's rows with
+            # ROW_NUMBER() and keep those within the domain's limit, in one
+            # query instead of one (plus a COUNT) per domain
+            from sqlalchemy import case, func, select
+            ranked = query.filter(Email.domain.in_(list(domain_limits))).with_entities(
+                Email.id.label('id'),
+                func.row_number().over(partition_by=Email.domain, order_by=Email.id).label('rn'),
+                case(domain_limits, value=Email.domain).label('domain_limit')
+            ).subquery()
+            export_query = export_query.filter(Email.id.in_(
+                select(ranked.c.id).where(ranked.c.rn <= ranked.c.domain_limit)
+            ))
+        elif filter_domains:
+            # Export all from specified domains (backward compatibility)
+            export_query = export_query.filter(Email.domain.in_(list(dict.fromkeys(filter_domains))))
+        elif random_limit and random_limit > 0 and query.count() > random_limit:
+            # Use ORDER BY RANDOM() with LIMIT for random sampling
+            from sqlalchemy import func
+            export_query = export_query.order_by(func.random()).limit(random_limit)
+        # Otherwise export everything the query matches
+        
+        job.total = export_query.count()
+        db.session.commit()
+        
+        # Create export folder
+        export_folder = current_app.config['EXPORT_FOLDER']
+        os.makedirs(export_folder, exist_ok=True)
+        
+        timestamp = started_at.strftime('%Y%m%d_%H%M%S')
+        
+        # Progress goes to Redis while rows stream; committing here would close
+        # the server-side cursor the rows are read from. Reports are throttled
+        # by time and reuse one meta dict for update_state
+        progress_due = progress_throttle(current_app.config.get('PROGRESS_REPORT_INTERVAL', 1.0))
+        progress_meta = {'current': 0, 'total': job.total, 'percent': 0.0}
+        
+        def report_progress(processed):
+            if not progress_due():
+                return
+            publish_progress(job.job_id, processed, job.total)
+            progress_meta['current'] = processed
+            progress_meta['percent'] = processed / job.total * 100 if job.total else 0.0
+            self.update_state(state='PROGRESS', meta=progress_meta)
+        
+        # Export emails
+        exported_count = 0
+        exported_ids = []
+        rows = _iter_export_rows(export_query, exported_ids)
+        file_count = 1
+        ext = 'txt' if export_format == 'txt' else 'csv'
+        
+        if split_files and job.total > split_size:
+            # Write each part of at most split_size rows straight into one ZIP
+            # archive, instead of writing the parts to disk and zipping them after
+            final_filename = f"export_{export_type}_{user_id}_{timestamp}.zip"
+            final_file_path = os.path.join(export_folder, final_filename)
+            
+            with open(final_file_path, 'wb') as archive:
+                with zipfile.ZipFile(archive, 'w', zipfile.ZIP_DEFLATED, compresslevel=1) as zipf:
+                    for file_number, first_row in enumerate(rows, start=1):
+                        filename = f"export_{export_type}_{user_id}_{timestamp}_part{file_number}.{ext}"
+                        part_rows = chain((first_row,), islice(rows, split_size - 1))
+                        
+                        with io.TextIOWrapper(zipf.open(filename, 'w'), encoding='utf-8', newline='') as f:
+                            chunk_count = _write_export_file(
+                                part_rows, f, fields, export_format,
+                                on_progress=lambda n: report_progress(exported_count + n)
+                            )
+                        
+                        file_count = file_number
+                        exported_count += chunk_count
                 
-                # Create single download history entry for ZIP
-                history = DownloadHistory(
-                    user_id=user_id,
-                    batch_id=batch_id,
-                    download_type=export_type,
-                    filter_domains=','.join(filter_domains) if filter_domains else None,
-                    filename=final_filename,
-                    file_path=final_file_path,
-                    file_size=final_file_size,
-                    record_count=exported_count
-                )
-                db.session.add(history)
-                db.session.flush()
-                history_ids = [history.id]
-            else:
-                # Create download history entries for single or non-split files
-                history_ids = []
-                for idx, (filename, file_path) in enumerate(file_paths):
-                    file_size = os.path.getsize(file_path)
-                    history = DownloadHistory(
-                        user_id=user_id,
-                        batch_id=batch_id,
-                        download_type=export_type,
-                        filter_domains=','.join(filter_domains) if filter_domains else None,
-                        filename=filename,
-                        file_path=file_path,
-                        file_size=file_size,
-                        record_count=file_counts[idx]
+                # Size of the finished archive, central directory included
+                file_size = archive.tell()
+        else:
+            # Single file export
+            final_filename = f"export_{export_type}_{user_id}_{timestamp}.{ext}"
+            final_file_path = os.path.join(export_folder, final_filename)
+            
+            copy_columns = _copy_export_columns(fields)
+            with open(final_file_path, 'w', newline='', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
+                if (db.engine.dialect.name == 'postgresql' and export_format != 'txt'
+                        and copy_columns is not None):
+                    # PostgreSQL writes the CSV itself and marks the rows downloaded
+                    # in the same statement
+                    exported_count = _copy_export_csv(export_query, f, copy_columns)
+                else:
+                    exported_count = _write_export_file(
+                        rows, f, fields, export_format, on_progress=report_progress
                     )
-                    db.session.add(history)
-                    db.session.flush()
-                    history_ids.append(history.id)
-            
-            db.session.commit()
-            
-            # Complete job
-            job.complete(
-                message=f'Exported {exported_count} emails in {len(file_paths)} file(s)',
-                result_data={
-                    'exported': exported_count,
-                    'files': len(file_paths),
-                    'history_id': history_ids[0] if history_ids else None,
-                    'history_ids': history_ids
-                }
+                file_size = f.tell()
+        
+        job.update_progress(exported_count)
+        
+        # Mark emails as downloaded with bulk UPDATEs instead of per-object changes
+        for id_slice in _chunked(exported_ids, IN_CLAUSE_CHUNK_SIZE):
+            db.session.execute(
+                update(Email).where(Email.id.in_(id_slice)).values(
+                    downloaded=True,
+                    download_count=Email.download_count + 1
+                ).execution_options(synchronize_session=False)
             )
-            
-            return {
-                'status': 'completed',
+        db.session.commit()
+        
+        # Create a single download history entry for the file or ZIP archive
+        history = DownloadHistory(
+            user_id=user_id,
+            batch_id=batch_id,
+            download_type=export_type,
+            filter_domains=','.join(filter_domains) if filter_domains else None,
+            filename=final_filename,
+            file_path=final_file_path,
+            file_size=file_size,
+            record_count=exported_count
+        )
+        db.session.add(history)
+        db.session.commit()
+        history_ids = [history.id]
+        
+        # Complete job
+        job.complete(
+            message=f'Exported {exported_count} emails in {file_count} file(s)',
+            result_data={
                 'exported': exported_count,
-                'files': len(file_paths),
+                'files': file_count,
+                'history_id': history_ids[0] if history_ids else None,
                 'history_ids': history_ids
             }
-            
-        except Exception as e:
-            if job:
-                job.fail(str(e))
-            raise
+        )
+        
+        return {
+            'status': 'completed',
+            'exported': exported_count,
+            'files': file_count,
+            'history_ids': history_ids
+        }
+        
+    except Exception as e:
+        # Discard the failed transaction so the failure itself can be recorded
+        db.session.rollback()
+        if job:
+            job.fail(str(e))
+        raise
 
 
-def _write_export_file(emails, file_path, fields, export_format, suppressed, job=None, task=None):
-    """Helper function to write export file"""
+def _iter_export_rows(query, exported_ids):
+    """Stream rows from the export query, recording the ids written"""
+    for row in query.yield_per(EXPORT_FETCH_SIZE):
+        exported_ids.append(row.id)
+        yield row
+
+
+def _copy_export_columns(fields):
+    """
+    Build labelled SQL expressions matching _write_export_file's CSV output,
+    or None if a field has no SQL equivalent.
+    """
+    from sqlalchemy import case, func, literal_column
+    
+    # Constants are literal SQL: literal_binds does not reach bound
+    # parameters in a RETURNING clause, and COPY takes no parameters
+    expressions = {
+        'email': Email.email,
+        'domain': Email.domain,
+        'quality_score': func.nullif(Email.quality_score, literal_column('0')),
+        'uploaded_at': func.to_char(Email.uploaded_at, literal_column("'YYYY-MM-DD HH24:MI:SS'")),
+        'domain_category': Email.domain_category,
+        'is_valid': case(
+            (Email.is_valid.is_(True), literal_column("'Yes'")),
+            (Email.is_valid.is_(False), literal_column("'No'"))
+        ),
+    }
+    if not all(field in expressions for field in fields):
+        return None
+    return [expressions[field].label(EXPORT_HEADERS[field]) for field in fields]
+
+
+class _CrlfWriter(io.TextIOBase):
+    """
+    Text sink turning COPY's LF row endings into the CRLF endings csv.writer
+    writes. Exported values never contain line breaks of their own.
+    """
+    
+    def __init__(self, f):
+        self._f = f
+        self.lines = 0
+    
+    def writable(self):
+        return True
+    
+    def write(self, data):
+        self.lines += data.count('\n')
+        self._f.write(data.replace('\n', '\r\n'))
+        return len(data)
+
+
+def _copy_export_csv(query, f, columns):
+    """
+    Write a CSV export with COPY (UPDATE ... RETURNING) TO STDOUT, so the rows
+    written are exactly the rows marked downloaded. Lines end with CRLF like
+    the csv.writer exports.
+    Returns the number of rows written: the COPY's row count, or the lines
+    after the header when the driver doesn't report one.
+    """
+    stmt = update(Email).where(
+        Email.id.in_(query.with_entities(Email.id).statement)
+    ).values(
+        downloaded=True,
+        download_count=Email.download_count + 1
+    ).returning(*columns)
+    sql = str(stmt.compile(dialect=db.engine.dialect, compile_kwargs={'literal_binds': True}))
+    
+    out = _CrlfWriter(f)
+    cursor = db.session.connection().connection.cursor()
+    try:
+        cursor.copy_expert(f'COPY ({sql}) TO STDOUT WITH (FORMAT csv, HEADER)', out)
+        # Drivers that don't report a COPY's row count give -1; every row is
+        # one line after the header then
+        return cursor.rowcount if cursor.rowcount >= 0 else max(out.lines - 1, 0)
+    finally:
+        cursor.close()
+
+
+def _join_csv_rows(rows, field_count):
+    """
+    Yield CSV lines for rows of string values, joining them directly and
+    formatting only rows whose values hold a comma, quote or line break
+    with csv.writer
+    """
+    quoted = io.StringIO()
+    quote_writer = csv.writer(quoted)
+    separators = field_count - 1
+    
+    for values in rows:
+        line = ','.join(values)
+        if line.count(',') == separators and '"' not in line and '\r' not in line and '\n' not in line:
+            yield line + '\r\n'
+        else:
+            quoted.seek(0)
+            quoted.truncate()
+            quote_writer.writerow(values)
+            yield quoted.getvalue()
+
+
+def _write_export_file(rows, f, fields, export_format, on_progress=None):
+    """
+    Helper function to write export rows to an open text file.
+    Returns the number of rows written.
+    """
     exported_count = 0
     
+    def tracked_rows():
+        nonlocal exported_count
+        for row in rows:
+            yield row
+            exported_count += 1
+            if on_progress and exported_count % 100 == 0:
+                on_progress(exported_count)
+    
     if export_format == 'txt':
         # TXT format - email list only
-        with open(file_path, 'w', encoding='utf-8') as f:
-            for idx, email_obj in enumerate(emails):
-                if email_obj.email in suppressed:
-                    continue
-                f.write(email_obj.email + '\n')
-                exported_count += 1
-                
-                if job and task and (idx + 1) % 100 == 0:
-                    job.update_progress(idx + 1)
-                    task.update_state(
-                        state='PROGRESS',
-                        meta={
-                            'current': idx + 1,
-                            'total': len(emails),
-                            'percent': (idx + 1) / len(emails) * 100
-                        }
-                    )
+        f.writelines(row.email + '\n' for row in tracked_rows())
     else:
-        # CSV format
-        with open(file_path, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            
-            # Write header
-            header = []
-            for field in fields:
-                if field == 'email':
-                    header.append('Email')
-                elif field == 'domain':
-                    header.append('Domain')
-                elif field == 'quality_score':
-                    header.append('Quality Score')
-                elif field == 'uploaded_at':
-                    header.append('Uploaded At')
-                elif field == 'domain_category':
-                    header.append('Domain Category')
-                elif field == 'is_valid':
-                    header.append('Is Valid')
-                else:
-                    header.append(field.replace('_', ' ').title())
-            writer.writerow(header)
-            
-            # Write data
-            for idx, email_obj in enumerate(emails):
-                if email_obj.email in suppressed:
-                    continue
-                
-                row = []
-                for field in fields:
-                    if field == 'email':
-                        row.append(email_obj.email)
-                    elif field == 'domain':
-                        row.append(email_obj.domain)
-                    elif field == 'quality_score':
-                        row.append(email_obj.quality_score or '')
-                    elif field == 'uploaded_at':
-                        row.append(email_obj.uploaded_at.strftime('%Y-%m-%d %H:%M:%S'))
-                    elif field == 'domain_category':
-                        row.append(email_obj.domain_category or '')
-                    elif field == 'is_valid':
-                        row.append('Yes' if email_obj.is_valid else 'No' if email_obj.is_valid is False else '')
-                    else:
-                        row.append(getattr(email_obj, field, ''))
-                writer.writerow(row)
-                exported_count += 1
-                
-                if job and task and (idx + 1) % 100 == 0:
-                    job.update_progress(idx + 1)
-                    task.update_state(
-                        state='PROGRESS',
-                        meta={
-                            'current': idx + 1,
-                            'total': len(emails),
-                            'percent': (idx + 1) / len(emails) * 100
-                        }
-                    )
+        # CSV format; headers and value getters are resolved once per export,
+        # not re-dispatched for every row
+        writer = csv.writer(f)
+        writer.writerow([
+            EXPORT_HEADERS.get(field) or field.replace('_', ' ').title()
+            for field in fields
+        ])
+        
+        getters = [
+            EXPORT_VALUE_GETTERS.get(field) or (lambda row, field=field: getattr(row, field, ''))
+            for field in fields
+        ]
+        # (a single empty field is the one value csv would still quote)
+        if len(fields) > 1 and CSV_SAFE_FIELDS.issuperset(fields):
+            f.writelines(
+                ','.join([str(get(row)) for get in getters]) + '\r\n'
+                for row in tracked_rows()
+            )
+        else:
+            writer.writerows([get(row) for get in getters] for row in tracked_rows())
     
     return exported_count
 
@@ -952,217 +1465,204 @@ def export_guest_emails_task(self, user_id, batch_id, export_type='all', export_
         custom_fields: List of fields to export (for CSV)
         random_limit: Optional limit to random sample of N emails
     """
-    from app import create_app
-    app = create_app()
-    
-    with app.app_context():
-        try:
-            # Get or create job record
-            job = Job.query.filter_by(job_id=self.request.id).first()
-            if not job:
-                job = Job(
-                    job_id=self.request.id,
-                    job_type='export',
-                    user_id=user_id,
-                    batch_id=batch_id,
-                    status='running'
-                )
-                db.session.add(job)
-                db.session.commit()
-            
-            job.status = 'running'
-            job.started_at = datetime.utcnow()
-            db.session.commit()
-            
-            # Verify user is guest
-            user = User.query.get(user_id)
-            if not user or not user.is_guest():
-                raise Exception('This export function is only for guest users')
-            
-            # Build query for guest email items
-            query = GuestEmailItem.query.filter_by(
+    job = None
+    try:
+        # Get or create job record
+        job = Job.query.filter_by(job_id=self.request.id).first()
+        if not job:
+            job = Job(
+                job_id=self.request.id,
+                job_type='export',
                 user_id=user_id,
-                batch_id=batch_id
+                batch_id=batch_id,
+                status='running'
             )
-            
-            # Apply filters based on export_type
-            if export_type == 'verified':
-                # Only items that link to validated & valid emails
-                query = query.join(Email, GuestEmailItem.matched_email_id == Email.id)\
-                    .filter(Email.is_validated.is_(True), Email.is_valid.is_(True))
-            elif export_type == 'smtp_verified':
-                # Only items linked to SMTP validated & valid emails
-                query = query.join(Email, GuestEmailItem.matched_email_id == Email.id)\
-                    .filter(Email.is_validated.is_(True), Email.is_valid.is_(True), Email.validation_method == 'smtp')
-            elif export_type == 'unverified':
-                # Items linked to unvalidated emails
-                query = query.join(Email, GuestEmailItem.matched_email_id == Email.id)\
-                    .filter(Email.is_validated.is_(False))
-            elif export_type == 'invalid':
-                # Items linked to validated but invalid emails
-                query = query.join(Email, GuestEmailItem.matched_email_id == Email.id)\
-                    .filter(Email.is_validated.is_(True), Email.is_valid.is_(False))
-            elif export_type == 'rejected':
-                # Items with result=rejected
-                query = query.filter(GuestEmailItem.result == 'rejected')
-            # 'all' exports everything
-            
-            # Apply random limit if specified
-            if random_limit and random_limit > 0:
-                from sqlalchemy import func
-                total_count = query.count()
-                if total_count > random_limit:
-                    # Use ORDER BY RANDOM() with LIMIT for random sampling
-                    query = query.order_by(func.random()).limit(random_limit)
-            
-            # Get items to export (eager load matched_email for efficiency)
-            from sqlalchemy.orm import joinedload
-            guest_items = query.options(joinedload(GuestEmailItem.matched_email)).all()
-            
-            job.total = len(guest_items)
+            db.session.add(job)
             db.session.commit()
-            
-            # Create export folder
-            export_folder = app.config['EXPORT_FOLDER']
-            os.makedirs(export_folder, exist_ok=True)
-            
-            timestamp = datetime.utcnow().strftime('%Y%m%d_%H%M%S')
-            
-            # Determine fields to export
-            if custom_fields:
-                fields = custom_fields
-            else:
-                if export_format == 'txt':
-                    fields = ['email']
-                else:
-                    fields = ['email', 'domain', 'result', 'status', 'quality_score']
-            
-            # Create filename
-            ext = 'txt' if export_format == 'txt' else 'csv'
-            filename = f"guest_export_{export_type}_{user_id}_batch{batch_id}_{timestamp}.{ext}"
-            file_path = os.path.join(export_folder, filename)
-            
-            # Write export file
-            exported_count = 0
-            
+        
+        job.status = 'running'
+        started_at = datetime.utcnow()
+        job.started_at = started_at
+        db.session.commit()
+        
+        # Verify user is guest
+        user = User.query.get(user_id)
+        if not user or not user.is_guest():
+            raise Exception('This export function is only for guest users')
+        
+        # Build query for guest email items
+        query = GuestEmailItem.query.filter_by(
+            user_id=user_id,
+            batch_id=batch_id
+        )
+        
+        # Apply filters based on export_type
+        if export_type == 'verified':
+            # Only items that link to validated & valid emails
+            query = query.join(Email, GuestEmailItem.matched_email_id == Email.id)\
+                .filter(Email.is_validated.is_(True), Email.is_valid.is_(True))
+        elif export_type == 'smtp_verified':
+            # Only items linked to SMTP validated & valid emails
+            query = query.join(Email, GuestEmailItem.matched_email_id == Email.id)\
+                .filter(Email.is_validated.is_(True), Email.is_valid.is_(True), Email.validation_method == 'smtp')
+        elif export_type == 'unverified':
+            # Items linked to unvalidated emails
+            query = query.join(Email, GuestEmailItem.matched_email_id == Email.id)\
+                .filter(Email.is_validated.is_(False))
+        elif export_type == 'invalid':
+            # Items linked to validated but invalid emails
+            query = query.join(Email, GuestEmailItem.matched_email_id == Email.id)\
+                .filter(Email.is_validated.is_(True), Email.is_valid.is_(False))
+        elif export_type == 'rejected':
+            # Items with result=rejected
+            query = query.filter(GuestEmailItem.result == 'rejected')
+        # 'all' exports everything
+        
+        # Apply random limit if specified
+        if random_limit and random_limit > 0:
+            from sqlalchemy import func
+            total_count = query.count()
+            if total_count > random_limit:
+                # Use ORDER BY RANDOM() with LIMIT for random sampling
+                query = query.order_by(func.random()).limit(random_limit)
+        
+        job.total = query.count()
+        db.session.commit()
+        
+        # Create export folder
+        export_folder = current_app.config['EXPORT_FOLDER']
+        os.makedirs(export_folder, exist_ok=True)
+        
+        timestamp = started_at.strftime('%Y%m%d_%H%M%S')
+        
+        # Determine fields to export
+        if custom_fields:
+            fields = custom_fields
+        else:
             if export_format == 'txt':
-                # TXT format - email list only
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    for idx, item in enumerate(guest_items):
-                        f.write(item.email_normalized + '\n')
-                        exported_count += 1
-                        
-                        if (idx + 1) % 100 == 0:
-                            job.update_progress(idx + 1)
-                            self.update_state(
-                                state='PROGRESS',
-                                meta={
-                                    'current': idx + 1,
-                                    'total': len(guest_items),
-                                    'percent': (idx + 1) / len(guest_items) * 100
-                                }
-                            )
+                fields = ['email']
             else:
-                # CSV format
-                with open(file_path, 'w', newline='', encoding='utf-8') as f:
-                    writer = csv.writer(f)
-                    
-                    # Write header
-                    header = []
-                    for field in fields:
-                        if field == 'email':
-                            header.append('Email')
-                        elif field == 'domain':
-                            header.append('Domain')
-                        elif field == 'result':
-                            header.append('Result')
-                        elif field == 'status':
-                            header.append('Status')
-                        elif field == 'quality_score':
-                            header.append('Quality Score')
-                        elif field == 'rejected_reason':
-                            header.append('Rejected Reason')
-                        else:
-                            header.append(field.replace('_', ' ').title())
-                    writer.writerow(header)
-                    
-                    # Write data
-                    for idx, item in enumerate(guest_items):
-                        row = []
-                        for field in fields:
-                            if field == 'email':
-                                row.append(item.email_normalized)
-                            elif field == 'domain':
-                                row.append(item.domain)
-                            elif field == 'result':
-                                row.append(item.result)
-                            elif field == 'status':
-                                # Get status from matched email
-                                if item.matched_email:
-                                    if item.matched_email.is_validated:
-                                        status = 'Valid' if item.matched_email.is_valid else 'Invalid'
-                                    else:
-                                        status = 'Unverified'
-                                elif item.result == 'rejected':
-                                    status = 'Rejected'
-                                else:
-                                    status = 'Unknown'
-                                row.append(status)
-                            elif field == 'quality_score':
-                                if item.matched_email:
-                                    row.append(item.matched_email.quality_score or '')
-                                else:
-                                    row.append('')
-                            elif field == 'rejected_reason':
-                                row.append(item.rejected_reason or '')
-                            else:
-                                row.append(getattr(item, field, ''))
-                        writer.writerow(row)
-                        exported_count += 1
-                        
-                        if (idx + 1) % 100 == 0:
-                            job.update_progress(idx + 1)
-                            self.update_state(
-                                state='PROGRESS',
-                                meta={
-                                    'current': idx + 1,
-                                    'total': len(guest_items),
-                                    'percent': (idx + 1) / len(guest_items) * 100
-                                }
-                            )
-            
-            # Create guest download history record
-            file_size = os.path.getsize(file_path)
-            guest_history = GuestDownloadHistory(
-                user_id=user_id,
-                batch_id=batch_id,
-                download_type=export_type,
-                filename=filename,
-                file_path=file_path,
-                file_size=file_size,
-                record_count=exported_count,
-                filters=export_format,
-                downloaded_times=1
-            )
-            db.session.add(guest_history)
-            db.session.commit()
-            
-            # Complete job
-            job.complete(
-                message=f'Exported {exported_count} guest email items',
-                result_data={
-                    'exported': exported_count,
-                    'history_id': guest_history.id
-                }
-            )
-            
-            return {
-                'status': 'completed',
+                fields = ['email', 'domain', 'result', 'status', 'quality_score']
+        
+        # Stream items to export in batches, loading only the columns written
+        from sqlalchemy.orm import joinedload, load_only, raiseload
+        if export_format == 'txt':
+            guest_items = query.with_entities(GuestEmailItem.email_normalized).yield_per(EXPORT_FETCH_SIZE)
+        elif all(field in GUEST_EXPORT_VALUE_GETTERS for field in fields):
+            # matched_email is many-to-one, so its joined rows are safe to stream.
+            # The getters read only the columns loaded here; anything else
+            # would be one SELECT per row, so it raises instead
+            guest_items = query.options(
+                joinedload(GuestEmailItem.matched_email).load_only(
+                    Email.is_validated, Email.is_valid, Email.quality_score, raiseload=True
+                ),
+                load_only(
+                    GuestEmailItem.email_normalized, GuestEmailItem.domain, GuestEmailItem.result,
+                    GuestEmailItem.rejected_reason, GuestEmailItem.matched_email_id,
+                    raiseload=True
+                ),
+                raiseload('*')
+            ).yield_per(EXPORT_FETCH_SIZE)
+        else:
+            # Custom fields are read with getattr and may name any attribute,
+            # so items and their matched email are loaded in full
+            guest_items = query.options(joinedload(GuestEmailItem.matched_email)).yield_per(EXPORT_FETCH_SIZE)
+        
+        # Create filename
+        ext = 'txt' if export_format == 'txt' else 'csv'
+        filename = f"guest_export_{export_type}_{user_id}_batch{batch_id}_{timestamp}.{ext}"
+        file_path = os.path.join(export_folder, filename)
+        
+        # Live progress is throttled by time and reuses one meta dict
+        progress_due = progress_throttle(current_app.config.get('PROGRESS_REPORT_INTERVAL', 1.0))
+        progress_meta = {'current': 0, 'total': job.total, 'percent': 0.0}
+        
+        def report_progress(processed):
+            if not progress_due():
+                return
+            publish_progress(job.job_id, processed, job.total)
+            progress_meta['current'] = processed
+            progress_meta['percent'] = processed / job.total * 100 if job.total else 0.0
+            self.update_state(state='PROGRESS', meta=progress_meta)
+        
+        # Write export file; rows go to the writer in one writelines/writerows
+        # call, counted by a wrapping generator
+        exported_count = 0
+        
+        def tracked_items():
+            nonlocal exported_count
+            for item in guest_items:
+                yield item
+                exported_count += 1
+                if exported_count % 100 == 0:
+                    report_progress(exported_count)
+        
+        if export_format == 'txt':
+            # TXT format - email list only
+            with open(file_path, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
+                f.writelines(item.email_normalized + '\n' for item in tracked_items())
+                file_size = f.tell()
+        else:
+            # CSV format
+            with open(file_path, 'w', newline='', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
+                writer = csv.writer(f)
+                
+                # Header and value getters are resolved once, not per row
+                writer.writerow([
+                    GUEST_EXPORT_HEADERS.get(field) or field.replace('_', ' ').title()
+                    for field in fields
+                ])
+                getters = [
+                    GUEST_EXPORT_VALUE_GETTERS.get(field) or (lambda item, field=field: getattr(item, field, ''))
+                    for field in fields
+                ]
+                
+                # Write data, joining rows directly when no value needs quoting
+                if len(fields) > 1 and GUEST_CSV_JOIN_FIELDS.issuperset(fields):
+                    f.writelines(_join_csv_rows(
+                        ([str(get(item)) for get in getters] for item in tracked_items()),
+                        len(fields)
+                    ))
+                else:
+                    writer.writerows([get(item) for get in getters] for item in tracked_items())
+                file_size = f.tell()
+        
+        # Live progress went to Redis; write the job row once
+        job.update_progress(exported_count)
+        
+        # Create guest download history record
+        guest_history = GuestDownloadHistory(
+            user_id=user_id,
+            batch_id=batch_id,
+            download_type=export_type,
+            filename=filename,
+            file_path=file_path,
+            file_size=file_size,
+            record_count=exported_count,
+            filters=export_format,
+            downloaded_times=1
+        )
+        db.session.add(guest_history)
+        db.session.commit()
+        
+        # Complete job
+        job.complete(
+            message=f'Exported {exported_count} guest email items',
+            result_data={
                 'exported': exported_count,
                 'history_id': guest_history.id
             }
-            
-        except Exception as e:
-            if job:
-                job.fail(str(e))
-            raise
+        )
+        
+        return {
+            'status': 'completed',
+            'exported': exported_count,
+            'history_id': guest_history.id
+        }
+        
+    except Exception as e:
+        # Discard the failed transaction so the failure itself can be recorded
+        db.session.rollback()
+        if job:
+            job.fail(str(e))
+        raise
@@ -36,6 +36,8 @@ class Email(db.Model):
     __table_args__ = (
         db.Index('idx_email_domain', 'email', 'domain'),
         db.Index('idx_batch_valid', 'batch_id', 'is_valid'),
+        # Case-insensitive lookups of existing emails (guest imports)
+        db.Index('ix_emails_email_lower', db.func.lower(email)),
     )
     
     def __repr__(self):
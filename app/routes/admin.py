@@ -244,11 +244,19 @@ def bulk_add_ignore_domains():
     added_count = 0
     skipped_count = 0
     
+    # Look up which domains already exist in one query rather than one per domain
+    existing = {
+        domain for (domain,) in db.session.query(IgnoreDomain.domain).filter(
+            IgnoreDomain.domain.in_(set(domains))
+        )
+    }
+    
     for domain in domains:
-        # Check if already exists
-        if IgnoreDomain.query.filter_by(domain=domain).first():
+        # Check if already exists (or was repeated in this submission)
+        if domain in existing:
             skipped_count += 1
             continue
+        existing.add(domain)
         
         # Add domain
         ignore_domain = IgnoreDomain(
@@ -6,6 +6,7 @@ from app.models.email import Email, Batch, RejectedEmail, GuestEmailItem
 from app.models.job import Job, DownloadHistory, GuestDownloadHistory
 from app.jobs.tasks import import_emails_task, validate_emails_task, export_emails_task, export_guest_emails_task
 from app.utils.helpers import log_activity
+from app.utils.progress import read_progress
 from app.utils.decorators import guest_cannot_access_main_db
 import os
 import csv
@@ -284,7 +285,20 @@ def job_status(job_id):
         flash('Access denied.', 'danger')
         return redirect(url_for('dashboard.index'))
     
-    return render_template('email/job_status.html', job=job)
+    return render_template('email/job_status.html', job=job, progress=_job_progress(job))
+
+def _job_progress(job):
+    """Current progress for a job, preferring live Redis progress while running"""
+    # Running jobs publish live progress to Redis between job row updates
+    progress = read_progress(job.job_id) if job.status == 'running' else None
+    if progress is None:
+        progress = {
+            'total': job.total,
+            'processed': job.processed,
+            'errors': job.errors,
+            'progress_percent': job.progress_percent
+        }
+    return progress
 
 @bp.route('/api/job/<job_id>/status')
 @login_required
@@ -296,15 +310,17 @@ def api_job_status(job_id):
     if not current_user.is_admin() and job.user_id != current_user.id:
         return jsonify({'error': 'Access denied'}), 403
     
+    progress = _job_progress(job)
+    
     return jsonify({
         'id': job.id,
         'job_id': job.job_id,
         'job_type': job.job_type,
         'status': job.status,
-        'total': job.total,
-        'processed': job.processed,
-        'errors': job.errors,
-        'progress_percent': job.progress_percent,
+        'total': progress['total'],
+        'processed': progress['processed'],
+        'errors': progress['errors'],
+        'progress_percent': progress['progress_percent'],
         'result_message': job.result_message,
         'error_message': job.error_message
     })
@@ -1,16 +1,18 @@
 # Utility modules
 from app.utils.decorators import role_required, admin_required, guest_cannot_access_main_db
 from app.utils.email_validator import (
-    is_valid_email_syntax, extract_domain, check_dns_mx,
+    is_valid_email_syntax, extract_domain, check_dns_mx, resolve_mx_bulk,
     is_role_based_email, check_us_only_cctld_policy,
-    classify_domain, validate_email_full
+    classify_domain, validate_email_full, make_validator
 )
 from app.utils.helpers import update_user_activity, log_activity, check_session_timeout
+from app.utils.progress import publish_progress, read_progress
 
 __all__ = [
     'role_required', 'admin_required', 'guest_cannot_access_main_db',
-    'is_valid_email_syntax', 'extract_domain', 'check_dns_mx',
+    'is_valid_email_syntax', 'extract_domain', 'check_dns_mx', 'resolve_mx_bulk',
     'is_role_based_email', 'check_us_only_cctld_policy',
-    'classify_domain', 'validate_email_full',
-    'update_user_activity', 'log_activity', 'check_session_timeout'
+    'classify_domain', 'validate_email_full', 'make_validator',
+    'update_user_activity', 'log_activity', 'check_session_timeout',
+    'publish_progress', 'read_progress'
 ]
@@ -1,4 +1,6 @@
 import re
+import time
+from functools import lru_cache
 from email_validator import validate_email as validate_email_lib, EmailNotValidError
 import dns.resolver
 import publicsuffix2
@@ -7,8 +9,33 @@ from flask import current_app
 # Initialize public suffix list
 psl = publicsuffix2.PublicSuffixList()
 
+# Conservative pattern for plain ASCII addresses. Anything it matches is also
+# accepted by email_validator, so the (much slower) library is only needed for
+# addresses outside this subset.
+SIMPLE_EMAIL_RE = re.compile(
+    r'[a-z0-9_%+-]+(?:\.[a-z0-9_%+-]+)*'
+    r'@(?:[a-z0-9](?:[a-z0-9-]{0,61}[a-z0-9])?\.)+[a-z]{2,63}',
+    re.IGNORECASE
+)
+
+# Special-use TLDs rejected by email_validator
+SPECIAL_USE_TLDS = {'arpa', 'invalid', 'local', 'localhost', 'onion', 'test'}
+
+def is_simple_email_syntax(email):
+    """Fast-path syntax check for common addresses that need no library call"""
+    if len(email) > 254 or '--' in email:
+        return False
+    if not SIMPLE_EMAIL_RE.fullmatch(email):
+        return False
+    local_part, _, domain = email.rpartition('@')
+    if len(local_part) > 64:
+        return False
+    return domain.rsplit('.', 1)[-1].lower() not in SPECIAL_USE_TLDS
+
 def is_valid_email_syntax(email):
     """Check if email has valid syntax"""
+    if is_simple_email_syntax(email):
+        return True, None
     try:
         validate_email_lib(email, check_deliverability=False)
         return True, None
@@ -25,23 +52,75 @@ def extract_domain(email):
         pass
     return None
 
-def check_dns_mx(domain):
-    """Check if domain has MX records"""
+# Seconds an MX answer is reused, so a domain that gains (or loses) its MX
+# records is seen again without restarting the worker
+MX_CACHE_TTL = 900
+
+@lru_cache(maxsize=100000)
+def _lookup_mx(domain, ttl_bucket):
+    """
+    Cached MX lookup for a lowercase domain. ttl_bucket is the current
+    MX_CACHE_TTL period, so cached answers expire when it changes.
+    Only definite answers are cached; timeouts and other errors propagate
+    so the domain is looked up again next time.
+    """
     try:
         dns.resolver.resolve(domain, 'MX')
         return True
+    except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer):
+        return False
+
+def check_dns_mx(domain):
+    """Check if domain has MX records"""
+    try:
+        return _lookup_mx(domain.lower(), int(time.monotonic() // MX_CACHE_TTL))
     except:
         return False
 
+def resolve_mx_bulk(domains, concurrency=200, timeout=5.0):
+    """
+    Check MX records for many domains concurrently.
+    Returns dict of domain -> has MX record (lookup failures count as False)
+    """
+    import asyncio
+    import dns.asyncresolver
+    
+    async def resolve_all():
+        resolver = dns.asyncresolver.Resolver()
+        resolver.lifetime = timeout
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def has_mx(domain):
+            async with semaphore:
+                try:
+                    await resolver.resolve(domain, 'MX')
+                    return True
+                except Exception:
+                    return False
+        
+        domain_list = list(domains)
+        results = await asyncio.gather(*(has_mx(d) for d in domain_list))
+        return dict(zip(domain_list, results))
+    
+    return asyncio.run(resolve_all())
+
+# Role-based local part prefixes (a tuple so str.startswith checks them all in C)
+ROLE_PREFIXES = (
+    'admin', 'info', 'support', 'sales', 'contact', 'help',
+    'webmaster', 'postmaster', 'noreply', 'no-reply', 'abuse'
+)
+
+# Known multi-level ccTLDs
+MULTI_LEVEL_CCTLDS = frozenset({
+    '.co.uk', '.com.au', '.co.nz', '.co.za', '.com.br',
+    '.co.jp', '.co.in', '.co.kr', '.com.cn', '.com.mx',
+    '.com.ar', '.com.co', '.ac.uk', '.gov.uk', '.org.uk'
+})
+
 def is_role_based_email(email):
     """Check if email uses role-based local part"""
-    role_prefixes = [
-        'admin', 'info', 'support', 'sales', 'contact', 'help',
-        'webmaster', 'postmaster', 'noreply', 'no-reply', 'abuse'
-    ]
-    
     local_part = email.split('@')[0].lower()
-    return any(local_part.startswith(prefix) for prefix in role_prefixes)
+    return local_part.startswith(ROLE_PREFIXES)
 
 def get_public_suffix(domain):
     """Get the public suffix of a domain"""
@@ -77,14 +156,7 @@ def is_cctld(domain):
             second_last = parts[-2]
             multi_level_tld = f'.{second_last}{tld}'
             
-            # Known multi-level ccTLDs
-            multi_level_cctlds = [
-                '.co.uk', '.com.au', '.co.nz', '.co.za', '.com.br',
-                '.co.jp', '.co.in', '.co.kr', '.com.cn', '.com.mx',
-                '.com.ar', '.com.co', '.ac.uk', '.gov.uk', '.org.uk'
-            ]
-            
-            if multi_level_tld in multi_level_cctlds:
+            if multi_level_tld in MULTI_LEVEL_CCTLDS:
                 return True, multi_level_tld
             
             # Check if it ends with .us (multi-level like .co.us is OK)
@@ -125,6 +197,13 @@ def check_us_only_cctld_policy(email):
     if not domain:
         return False, 'Invalid email format'
     
+    return check_domain_policy(domain)
+
+def check_domain_policy(domain):
+    """
+    Apply the US-only ccTLD policy to an already extracted domain.
+    Returns (allowed, reason)
+    """
     # Check policy suffixes first
     is_policy, suffix = is_policy_suffix(domain)
     if is_policy:
@@ -143,12 +222,18 @@ def check_us_only_cctld_policy(email):
     # Generic TLD - allow
     return True, None
 
+@lru_cache(maxsize=8)
+def _top_domain_set(top_domains):
+    """Lowercase set of the configured TOP_DOMAINS, built once per distinct list"""
+    return frozenset(d.lower() for d in top_domains)
+
 def classify_domain(domain):
     """Classify domain into TOP_DOMAINS or 'mixed'"""
-    top_domains = current_app.config.get('TOP_DOMAINS', [])
+    top_domains = _top_domain_set(tuple(current_app.config.get('TOP_DOMAINS', [])))
     
-    if domain.lower() in [d.lower() for d in top_domains]:
-        return domain.lower()
+    domain = domain.lower()
+    if domain in top_domains:
+        return domain
     
     return 'mixed'
 
@@ -156,6 +241,8 @@ def validate_email_full(email, check_dns=False, check_role=False, ignore_domains
     """
     Full email validation with multiple checks.
     Returns (is_valid, error_type, error_message)
+    
+    ignore_domains should be a set/frozenset of lowercase domains.
     """
     # Syntax check
     is_valid_syntax, syntax_error = is_valid_email_syntax(email)
@@ -168,11 +255,11 @@ def validate_email_full(email, check_dns=False, check_role=False, ignore_domains
         return False, 'invalid_format', 'Could not extract domain'
     
     # Check ignore domains
-    if ignore_domains and domain.lower() in [d.lower() for d in ignore_domains]:
+    if ignore_domains and domain.lower() in ignore_domains:
         return False, 'ignore_domain', f'Domain {domain} is in ignore list'
     
     # Check US-only ccTLD policy
-    allowed, reason = check_us_only_cctld_policy(email)
+    allowed, reason = check_domain_policy(domain)
     if not allowed:
         if 'ccTLD' in reason:
             return False, 'cctld_policy', reason
@@ -190,6 +277,69 @@ def validate_email_full(email, check_dns=False, check_role=False, ignore_domains
     
     return True, None, None
 
+def make_validator(check_dns=False, check_role=False, ignore_domains=None):
+    """
+    Build a validator equivalent to validate_email_full with the flags fixed,
+    for loops that validate a whole batch with the same settings.
+    Returns a function taking an email (and optionally its already extracted
+    domain) and returning (is_valid, error_type, error_message)
+    """
+    ignore_domains = frozenset(ignore_domains or ())
+    
+    # Only the checks enabled for this batch are run per email
+    extra_checks = []
+    if check_role:
+        extra_checks.append(lambda email, domain: (
+            ('role_based', 'Role-based email address') if is_role_based_email(email) else None
+        ))
+    if check_dns:
+        extra_checks.append(lambda email, domain: (
+            None if check_dns_mx(domain) else ('no_mx_record', 'No MX record found for domain')
+        ))
+    extra_checks = tuple(extra_checks)
+    
+    # Ignore-list and ccTLD/policy verdicts depend only on the domain, so each
+    # distinct domain is checked once per validator
+    domain_failures = {}
+    
+    def check_domain(domain):
+        if domain.lower() in ignore_domains:
+            return 'ignore_domain', f'Domain {domain} is in ignore list'
+        
+        allowed, reason = check_domain_policy(domain)
+        if not allowed:
+            if 'ccTLD' in reason:
+                return 'cctld_policy', reason
+            elif 'Policy suffix' in reason:
+                return 'policy_suffix', reason
+        return None
+    
+    def validate(email, domain=None):
+        is_valid_syntax, syntax_error = is_valid_email_syntax(email)
+        if not is_valid_syntax:
+            return False, 'invalid_syntax', syntax_error
+        
+        if domain is None:
+            domain = extract_domain(email)
+        if not domain:
+            return False, 'invalid_format', 'Could not extract domain'
+        
+        try:
+            failure = domain_failures[domain]
+        except KeyError:
+            failure = domain_failures[domain] = check_domain(domain)
+        if failure:
+            return False, failure[0], failure[1]
+        
+        for check in extra_checks:
+            failure = check(email, domain)
+            if failure:
+                return False, failure[0], failure[1]
+        
+        return True, None, None
+    
+    return validate
+
 # Common disposable email domains
 DISPOSABLE_DOMAINS = {
     'tempmail.com', '10minutemail.com', 'guerrillamail.com', 'mailinator.com',
@@ -199,6 +349,9 @@ DISPOSABLE_DOMAINS = {
     'mintemail.com', 'emailondeck.com', 'guerrillamail.info', 'guerrillamail.net'
 }
 
+# Substrings that mark a domain as disposable
+DISPOSABLE_PATTERNS = ('temp', 'trash', 'fake', 'throwaway', 'disposable', 'guerrilla')
+
 def is_disposable_email(email):
     """
     Check if email is from a disposable/temporary email service
@@ -215,8 +368,7 @@ def is_disposable_email(email):
         return True, domain_lower
     
     # Check for common disposable patterns
-    disposable_patterns = ['temp', 'trash', 'fake', 'throwaway', 'disposable', 'guerrilla']
-    for pattern in disposable_patterns:
+    for pattern in DISPOSABLE_PATTERNS:
         if pattern in domain_lower:
             return True, domain_lower
     
@@ -294,10 +446,14 @@ def calculate_email_quality_score(email, is_valid=None, has_mx=None, is_role=Non
     return max(0, min(100, score))
 
 def validate_email_enhanced(email, check_dns=False, check_smtp=False, check_role=False, 
-                           check_disposable=True, ignore_domains=None):
+                           check_disposable=True, ignore_domains=None, mx_results=None):
     """
     Enhanced email validation with quality scoring
     Returns (is_valid, error_type, error_message, quality_score, details)
+    
+    ignore_domains should be a set/frozenset of lowercase domains.
+    mx_results optionally maps domain -> has MX record, so callers validating
+    many emails can resolve each domain once up front.
     """
     details = {
         'has_mx': None,
@@ -322,13 +478,13 @@ def validate_email_enhanced(email, check_dns=False, check_smtp=False, check_role
     details['domain_category'] = classify_domain(domain)
     
     # Check ignore domains
-    if ignore_domains and domain.lower() in [d.lower() for d in ignore_domains]:
+    if ignore_domains and domain.lower() in ignore_domains:
         quality_score = calculate_email_quality_score(email, is_valid=False, 
                                                       domain_category=details['domain_category'])
         return False, 'ignore_domain', f'Domain {domain} is in ignore list', quality_score, details
     
     # Check US-only ccTLD policy
-    allowed, reason = check_us_only_cctld_policy(email)
+    allowed, reason = check_domain_policy(domain)
     if not allowed:
         quality_score = calculate_email_quality_score(email, is_valid=False,
                                                       domain_category=details['domain_category'])
@@ -360,7 +516,10 @@ def validate_email_enhanced(email, check_dns=False, check_smtp=False, check_role
     
     # DNS/MX check
     if check_dns:
-        details['has_mx'] = check_dns_mx(domain)
+        if mx_results is not None and domain in mx_results:
+            details['has_mx'] = mx_results[domain]
+        else:
+            details['has_mx'] = check_dns_mx(domain)
         if not details['has_mx']:
             quality_score = calculate_email_quality_score(email, is_valid=False,
                                                           has_mx=False,
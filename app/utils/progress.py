@@ -0,0 +1,81 @@
+import time
+import redis
+from flask import current_app
+
+# Progress entries outlive the job briefly so late polls still see them
+PROGRESS_TTL = 3600
+
+# Progress is best-effort: a slow or unreachable Redis must not stall the
+# task loops or status polls that report it, so connects and reads give up fast
+REDIS_SOCKET_TIMEOUT = 1.0
+
+_redis_client = None
+
+def get_redis():
+    """Return a process-wide Redis client backed by a connection pool"""
+    global _redis_client
+    if _redis_client is None:
+        _redis_client = redis.Redis.from_url(
+            current_app.config['REDIS_URL'],
+            decode_responses=True,
+            socket_connect_timeout=REDIS_SOCKET_TIMEOUT,
+            socket_timeout=REDIS_SOCKET_TIMEOUT
+        )
+    return _redis_client
+
+def progress_key(job_id):
+    """Redis key holding live progress for a Celery job"""
+    return f'job_progress:{job_id}'
+
+def publish_progress(job_id, processed, total, errors=0):
+    """
+    Record job progress in Redis using a single pipelined round-trip.
+    Returns False if Redis is unavailable (progress is advisory).
+    """
+    percent = (processed / total) * 100 if total > 0 else 0.0
+    key = progress_key(job_id)
+    try:
+        with get_redis().pipeline(transaction=False) as pipe:
+            pipe.hset(key, mapping={
+                'processed': processed,
+                'total': total,
+                'errors': errors,
+                'progress_percent': percent
+            })
+            pipe.expire(key, PROGRESS_TTL)
+            pipe.execute()
+    except redis.RedisError:
+        return False
+    return True
+
+def progress_throttle(interval):
+    """
+    Return a callable that is True at most once per interval seconds, so long
+    loops report progress by wall-clock time rather than by row count
+    """
+    last = time.monotonic()
+    
+    def due():
+        nonlocal last
+        now = time.monotonic()
+        if now - last < interval:
+            return False
+        last = now
+        return True
+    
+    return due
+
+def read_progress(job_id):
+    """Return live progress for a job from Redis, or None if not available"""
+    try:
+        data = get_redis().hgetall(progress_key(job_id))
+    except redis.RedisError:
+        return None
+    if not data:
+        return None
+    return {
+        'processed': int(data['processed']),
+        'total': int(data['total']),
+        'errors': int(data['errors']),
+        'progress_percent': float(data['progress_percent'])
+    }
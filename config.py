@@ -22,6 +22,23 @@ class Config:
     REDIS_URL = os.environ.get('REDIS_URL', 'redis://localhost:6379/0')
     CELERY_BROKER_URL = os.environ.get('CELERY_BROKER_URL', 'redis://localhost:6379/0')
     CELERY_RESULT_BACKEND = os.environ.get('CELERY_RESULT_BACKEND', 'redis://localhost:6379/0')
+    # Imports, validations and exports are long-running, so each worker process
+    # reserves one task at a time by default
+    CELERY_PREFETCH_MULTIPLIER = int(os.environ.get('CELERY_PREFETCH_MULTIPLIER', 1))
+    # Off by default: a redelivered import would insert its rows a second time
+    CELERY_ACKS_LATE = os.environ.get('CELERY_ACKS_LATE', 'false').lower() == 'true'
+    
+    # Import settings
+    IMPORT_BATCH_SIZE = int(os.environ.get('IMPORT_BATCH_SIZE', 1000))  # Rows per bulk INSERT
+    
+    # Progress settings (live progress goes to Redis; the jobs row is updated less often)
+    PROGRESS_COMMIT_INTERVAL = int(os.environ.get('PROGRESS_COMMIT_INTERVAL', 10000))
+    PROGRESS_REPORT_INTERVAL = float(os.environ.get('PROGRESS_REPORT_INTERVAL', 1.0))  # Seconds between live updates
+    
+    # Validation settings
+    DNS_CONCURRENCY = int(os.environ.get('DNS_CONCURRENCY', 200))  # Concurrent MX lookups
+    VALIDATION_CHUNK_SIZE = int(os.environ.get('VALIDATION_CHUNK_SIZE', 5000))  # Emails per parallel sub-task
+    VALIDATION_PAGE_SIZE = int(os.environ.get('VALIDATION_PAGE_SIZE', 1000))  # Emails validated per commit
     
     # Top domains for classification
     TOP_DOMAINS = [
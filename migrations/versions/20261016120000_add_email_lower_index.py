@@ -0,0 +1,25 @@
+"""add index on lower(email)
+
+Revision ID: 20261016120000
+Revises: 20251228115507
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '20261016120000'
+down_revision = '20251228115507'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Guest imports look up existing emails case-insensitively
+    op.create_index('ix_emails_email_lower', 'emails', [sa.text('lower(email)')], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_emails_email_lower', table_name='emails')
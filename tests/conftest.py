@@ -0,0 +1,5 @@
+import os
+
+# Config reads DATABASE_URL when it is first imported, which may be by any
+# test module; set it here so every module gets the in-memory database
+os.environ['DATABASE_URL'] = 'sqlite:///:memory:'
@@ -0,0 +1,160 @@
+import pytest
+
+from app import create_app
+from app.utils.email_validator import is_simple_email_syntax, is_valid_email_syntax
+
+@pytest.fixture
+def app():
+    """Create application for testing; domain policy checks read its config"""
+    app = create_app()
+    app.config['TESTING'] = True
+    
+    with app.app_context():
+        yield app
+
+class TestSyntaxFastPath:
+    """Test the regex fast path for email syntax"""
+    
+    def test_simple_addresses_match(self):
+        """Test that common addresses take the fast path"""
+        test_cases = [
+            'user@example.com',
+            'first.last@example.co.uk',
+            'user+tag@sub.example.org',
+            'USER_1@Example.NET',
+        ]
+        
+        for email in test_cases:
+            assert is_simple_email_syntax(email), f"{email} should take the fast path"
+    
+    def test_unusual_addresses_fall_back(self):
+        """Test that addresses outside the simple subset are left to the library"""
+        test_cases = [
+            'user..name@example.com',
+            '.user@example.com',
+            'user@example',
+            'user@-example.com',
+            'user@example.c',
+            'user@xn--bcher-kva.com',
+            'user@host.localhost',
+            'a' * 65 + '@example.com',
+        ]
+        
+        for email in test_cases:
+            assert not is_simple_email_syntax(email), f"{email} should not take the fast path"
+    
+    def test_fast_path_agrees_with_library(self):
+        """Test that fast-path matches are also accepted by email_validator"""
+        from email_validator import validate_email
+        
+        test_cases = [
+            'user@example.com',
+            'first.last@example.co.uk',
+            'user+tag@sub.example.org',
+            'x%y@example.info',
+        ]
+        
+        for email in test_cases:
+            assert is_simple_email_syntax(email)
+            validate_email(email, check_deliverability=False)
+            assert is_valid_email_syntax(email) == (True, None)
+
+class TestMakeValidator:
+    """Test validators specialized for fixed flags"""
+    
+    def test_matches_validate_email_full(self, app):
+        """Test that the specialized validator gives the same results"""
+        from app.utils.email_validator import make_validator, validate_email_full
+        
+        ignore_domains = frozenset({'ignored.com'})
+        test_cases = [
+            'user@example.com',
+            'not-an-email',
+            'user@ignored.com',
+            'user@IGNORED.com',
+            'info@example.com',
+            'user@example.co.uk',
+        ]
+        
+        for check_role in (False, True):
+            validate = make_validator(check_role=check_role, ignore_domains=ignore_domains)
+            for email in test_cases:
+                expected = validate_email_full(email, check_role=check_role, ignore_domains=ignore_domains)
+                assert validate(email) == expected, f"{email} (check_role={check_role})"
+    
+    def test_precomputed_domain(self, app):
+        """Test that passing the already extracted domain gives the same result"""
+        from app.utils.email_validator import make_validator, extract_domain
+        
+        validate = make_validator(ignore_domains=frozenset({'ignored.com'}))
+        for email in ('user@example.com', 'user@ignored.com', 'not-an-email', 'a@b@c.com'):
+            assert validate(email, extract_domain(email)) == validate(email)
+
+class TestMxLookupCache:
+    """Test per-domain caching of MX lookups"""
+    
+    def test_domain_resolved_once(self, monkeypatch):
+        """Test that repeated checks for a domain reuse the first answer"""
+        import dns.resolver
+        from app.utils.email_validator import check_dns_mx, _lookup_mx
+        
+        calls = []
+        
+        def fake_resolve(domain, rdtype):
+            calls.append(domain)
+            return ['mx.example.com']
+        
+        monkeypatch.setattr(dns.resolver, 'resolve', fake_resolve)
+        _lookup_mx.cache_clear()
+        
+        assert check_dns_mx('example.com')
+        assert check_dns_mx('EXAMPLE.com')
+        assert calls == ['example.com']
+    
+    def test_lookup_errors_not_cached(self, monkeypatch):
+        """Test that a failed lookup is retried on the next check"""
+        import dns.exception
+        import dns.resolver
+        from app.utils.email_validator import check_dns_mx, _lookup_mx
+        
+        calls = []
+        
+        def flaky_resolve(domain, rdtype):
+            calls.append(domain)
+            if len(calls) == 1:
+                raise dns.exception.Timeout()
+            return ['mx.example.org']
+        
+        monkeypatch.setattr(dns.resolver, 'resolve', flaky_resolve)
+        _lookup_mx.cache_clear()
+        
+        assert not check_dns_mx('example.org')
+        assert check_dns_mx('example.org')
+        assert len(calls) == 2
+    
+    def test_answers_expire(self, monkeypatch):
+        """Test that a cached "no MX" answer is looked up again after MX_CACHE_TTL"""
+        import dns.resolver
+        from app.utils import email_validator
+        from app.utils.email_validator import check_dns_mx, _lookup_mx, MX_CACHE_TTL
+        
+        calls = []
+        
+        def late_mx_resolve(domain, rdtype):
+            calls.append(domain)
+            if len(calls) == 1:
+                raise dns.resolver.NoAnswer()
+            return ['mx.example.net']
+        
+        now = [1000.0 * MX_CACHE_TTL]
+        monkeypatch.setattr(dns.resolver, 'resolve', late_mx_resolve)
+        monkeypatch.setattr(email_validator.time, 'monotonic', lambda: now[0])
+        _lookup_mx.cache_clear()
+        
+        assert not check_dns_mx('example.net')
+        assert not check_dns_mx('example.net')
+        assert len(calls) == 1
+        
+        now[0] += MX_CACHE_TTL
+        assert check_dns_mx('example.net')
+        assert len(calls) == 2
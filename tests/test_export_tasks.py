@@ -0,0 +1,362 @@
+import pytest
+import os
+import csv
+import io
+import zipfile
+
+from app import create_app, db
+from config import Config
+from app.models.user import User
+from app.models.email import Email, Batch, GuestEmailItem, SuppressionList
+from app.models.job import DownloadHistory, GuestDownloadHistory
+from app.jobs import tasks
+from app.jobs.tasks import export_emails_task, export_guest_emails_task, _join_csv_rows
+
+@pytest.fixture
+def app(tmp_path):
+    """Create application for testing"""
+    app = create_app()
+    app.config['TESTING'] = True
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['CELERY_BROKER_URL'] = 'memory://'
+    app.config['CELERY_RESULT_BACKEND'] = 'cache+memory://'
+    app.config['EXPORT_FOLDER'] = str(tmp_path)
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.drop_all()
+
+# PostgreSQL-only export paths (COPY) run against this database when it is set
+POSTGRES_URL = os.environ.get('TEST_POSTGRES_URL')
+requires_postgres = pytest.mark.skipif(not POSTGRES_URL, reason='TEST_POSTGRES_URL not set')
+
+@pytest.fixture
+def pg_app(tmp_path):
+    """Create application on the PostgreSQL test database"""
+    class PostgresConfig(Config):
+        SQLALCHEMY_DATABASE_URI = POSTGRES_URL
+        EXPORT_FOLDER = str(tmp_path)
+    
+    app = create_app(PostgresConfig)
+    app.config['TESTING'] = True
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+@pytest.fixture
+def guest_user(app):
+    """Create a guest user"""
+    user = User(username='testguest', email='guest@test.com', role='guest')
+    user.set_password('password')
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+@pytest.fixture
+def regular_user(app):
+    """Create a regular user"""
+    user = User(username='testuser', email='user@test.com', role='user')
+    user.set_password('password')
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+@pytest.fixture
+def pg_user(pg_app):
+    """Create a regular user in the PostgreSQL test database"""
+    user = User(username='testuser', email='user@test.com', role='user')
+    user.set_password('password')
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+def _add_batch(user):
+    """Add a batch of five valid emails, one of them suppressed, and one invalid email"""
+    batch = Batch(name='Export Batch', filename='export.csv', user_id=user.id, status='validated')
+    db.session.add(batch)
+    db.session.commit()
+
+    for i in range(5):
+        db.session.add(Email(email=f'valid{i}@example.com', domain='example.com', batch_id=batch.id,
+                             uploaded_by=user.id, is_validated=True, is_valid=True))
+    db.session.add(Email(email='invalid@example.com', domain='example.com', batch_id=batch.id,
+                         uploaded_by=user.id, is_validated=True, is_valid=False))
+    db.session.add(SuppressionList(email='valid4@example.com', reason='opt_out'))
+    db.session.commit()
+    return batch
+
+@pytest.fixture
+def batch(app, regular_user):
+    """Create the export batch for the regular user"""
+    return _add_batch(regular_user)
+
+def _read_csv(file_path):
+    with open(file_path, newline='', encoding='utf-8') as f:
+        return list(csv.reader(f))
+
+def _run_export(user, job_id='test-export', **kwargs):
+    return export_emails_task.apply(args=(user.id,), kwargs=kwargs, task_id=job_id).get()
+
+class TestExportFile:
+    """Test the files written by export_emails_task"""
+
+    def test_verified_csv(self, app, regular_user, batch):
+        """Test a verified export writes the valid, unsuppressed emails"""
+        result = _run_export(regular_user, batch_id=batch.id, custom_fields=['email', 'domain'])
+
+        assert result['exported'] == 4
+        history = db.session.get(DownloadHistory, result['history_ids'][0])
+        assert history.record_count == 4
+        assert history.file_size == os.path.getsize(history.file_path)
+
+        with open(history.file_path, newline='', encoding='utf-8') as f:
+            content = f.read()
+        rows = list(csv.reader(io.StringIO(content)))
+        assert rows[0] == ['Email', 'Domain']
+        assert sorted(row[0] for row in rows[1:]) == [f'valid{i}@example.com' for i in range(4)]
+        assert all(row[1] == 'example.com' for row in rows[1:])
+        assert content.count('\r\n') == 5
+
+    def test_txt(self, app, regular_user, batch):
+        """Test a TXT export writes one address per line"""
+        result = _run_export(regular_user, batch_id=batch.id, export_format='txt')
+
+        history = db.session.get(DownloadHistory, result['history_ids'][0])
+        with open(history.file_path, encoding='utf-8') as f:
+            lines = f.read().splitlines()
+        assert sorted(lines) == [f'valid{i}@example.com' for i in range(4)]
+
+    def test_domain_limits(self, app, regular_user, batch):
+        """Test domain limits cap the rows exported per domain"""
+        db.session.add(Email(email='other@example.org', domain='example.org', batch_id=batch.id,
+                             uploaded_by=regular_user.id, is_validated=True, is_valid=True))
+        db.session.commit()
+
+        result = _run_export(regular_user, batch_id=batch.id, export_format='txt',
+                             domain_limits={'example.com': 2, 'example.org': 5})
+
+        assert result['exported'] == 3
+        history = db.session.get(DownloadHistory, result['history_ids'][0])
+        with open(history.file_path, encoding='utf-8') as f:
+            lines = f.read().splitlines()
+        assert sorted(lines) == ['other@example.org', 'valid0@example.com', 'valid1@example.com']
+
+    def test_marks_exported_emails_downloaded(self, app, regular_user, batch):
+        """Test only exported emails are marked downloaded, once per export"""
+        _run_export(regular_user, batch_id=batch.id)
+        _run_export(regular_user, job_id='test-export-2', batch_id=batch.id)
+
+        counts = {e.email: (e.downloaded, e.download_count) for e in Email.query.filter_by(batch_id=batch.id)}
+        for i in range(4):
+            assert counts[f'valid{i}@example.com'] == (True, 2)
+        assert counts['valid4@example.com'] == (False, 0)
+        assert counts['invalid@example.com'] == (False, 0)
+
+    def test_split_files_zip(self, app, regular_user, batch):
+        """Test a split export writes parts of at most split_size rows into one ZIP"""
+        result = _run_export(regular_user, batch_id=batch.id, export_type='all',
+                             split_files=True, split_size=2, custom_fields=['email'])
+
+        assert result['exported'] == 5
+        assert result['files'] == 3
+        history = db.session.get(DownloadHistory, result['history_ids'][0])
+        assert history.filename.endswith('.zip')
+        assert history.record_count == 5
+        assert history.file_size == os.path.getsize(history.file_path)
+
+        exported = []
+        with zipfile.ZipFile(history.file_path) as zipf:
+            names = sorted(zipf.namelist())
+            assert [name.rsplit('_', 1)[1] for name in names] == ['part1.csv', 'part2.csv', 'part3.csv']
+            for name in names:
+                rows = list(csv.reader(io.StringIO(zipf.read(name).decode('utf-8'))))
+                assert rows[0] == ['Email']
+                assert 1 <= len(rows) - 1 <= 2
+                exported.extend(row[0] for row in rows[1:])
+
+        assert sorted(exported) == sorted(
+            [f'valid{i}@example.com' for i in range(4)] + ['invalid@example.com']
+        )
+        assert Email.query.filter_by(downloaded=True).count() == 5
+
+@requires_postgres
+class TestCopyExport:
+    """Test CSV exports written by PostgreSQL COPY"""
+
+    def test_copy_export(self, pg_app, pg_user):
+        """Test COPY writes CRLF lines, counts its rows and marks them downloaded"""
+        batch = _add_batch(pg_user)
+
+        result = _run_export(pg_user, batch_id=batch.id)
+
+        assert result['exported'] == 4
+        history = db.session.get(DownloadHistory, result['history_ids'][0])
+        assert history.record_count == 4
+        assert history.file_size == os.path.getsize(history.file_path)
+
+        with open(history.file_path, newline='', encoding='utf-8') as f:
+            content = f.read()
+        assert content.count('\r\n') == 5
+        assert content.count('\n') == 5
+        rows = list(csv.reader(io.StringIO(content)))
+        assert rows[0] == ['Email', 'Domain', 'Quality Score', 'Uploaded At']
+        assert sorted(row[0] for row in rows[1:]) == [f'valid{i}@example.com' for i in range(4)]
+
+        db.session.expire_all()
+        downloaded = sorted(e.email for e in Email.query.filter_by(downloaded=True, download_count=1))
+        assert downloaded == [f'valid{i}@example.com' for i in range(4)]
+
+class _FakeCopyCursor:
+    """Cursor stub whose COPY writes fixed LF-terminated output in pieces"""
+
+    def __init__(self, output, rowcount):
+        self.output = output
+        self.rowcount = rowcount
+        self.statements = []
+        self.closed = False
+
+    def copy_expert(self, sql, f):
+        self.statements.append(sql)
+        # psycopg2 writes COPY data a row at a time
+        for line in self.output.splitlines(keepends=True):
+            f.write(line)
+
+    def close(self):
+        self.closed = True
+
+class TestCopyExportCsv:
+    """Test _copy_export_csv without a PostgreSQL server"""
+
+    def _copy(self, monkeypatch, cursor):
+        class FakeConnection:
+            connection = type('DBAPIConnection', (), {'cursor': lambda self: cursor})()
+
+        monkeypatch.setattr(db.session, 'connection', lambda: FakeConnection())
+        query = Email.query.filter_by(is_validated=True)
+        out = io.StringIO(newline='')
+        count = tasks._copy_export_csv(query, out, tasks._copy_export_columns(['email', 'domain']))
+        return count, out.getvalue()
+
+    def test_crlf_and_rowcount(self, app, monkeypatch):
+        """Test COPY output gets CRLF endings and the count comes from cursor.rowcount"""
+        cursor = _FakeCopyCursor('Email,Domain\na@example.com,example.com\nb@example.com,example.com\n', 2)
+
+        count, content = self._copy(monkeypatch, cursor)
+
+        assert count == 2
+        assert content == 'Email,Domain\r\na@example.com,example.com\r\nb@example.com,example.com\r\n'
+        assert cursor.closed
+        sql = cursor.statements[0]
+        assert sql.startswith('COPY (UPDATE emails SET downloaded=')
+        assert 'AS "Email"' in sql and 'AS "Domain"' in sql
+        assert sql.endswith(') TO STDOUT WITH (FORMAT csv, HEADER)')
+
+    def test_unknown_rowcount_counts_lines(self, app, monkeypatch):
+        """Test a driver reporting rowcount -1 falls back to the lines written"""
+        cursor = _FakeCopyCursor('Email,Domain\na@example.com,example.com\nb@example.com,example.com\n', -1)
+
+        count, _ = self._copy(monkeypatch, cursor)
+
+        assert count == 2
+
+    def test_empty_export(self, app, monkeypatch):
+        """Test an export matching no rows writes only the header"""
+        count, content = self._copy(monkeypatch, _FakeCopyCursor('Email,Domain\n', -1))
+
+        assert count == 0
+        assert content == 'Email,Domain\r\n'
+
+class TestGuestExportFile:
+    """Test the contents of guest export files"""
+
+    def test_rejected_raw_values_are_quoted(self, app, guest_user):
+        """Test raw rejected input with commas and quotes survives a CSV round trip"""
+        batch = Batch(name='Guest Batch', filename='guest.csv', user_id=guest_user.id, status='uploaded')
+        db.session.add(batch)
+        db.session.commit()
+
+        raw_values = ['x,y@example.com', 'say "hi"@example.com']
+        for value in raw_values:
+            db.session.add(GuestEmailItem(
+                batch_id=batch.id,
+                user_id=guest_user.id,
+                email_normalized=value,
+                domain='example.com',
+                result='rejected',
+                rejected_reason='invalid_syntax'
+            ))
+        db.session.commit()
+
+        result = export_guest_emails_task.apply(
+            args=(guest_user.id, batch.id),
+            kwargs={'export_type': 'rejected'},
+            task_id='test-guest-export'
+        ).get()
+
+        assert result['exported'] == 2
+
+        history = db.session.get(GuestDownloadHistory, result['history_id'])
+        rows = _read_csv(history.file_path)
+        assert rows[0] == ['Email', 'Domain', 'Result', 'Status', 'Quality Score']
+        assert sorted(row[0] for row in rows[1:]) == sorted(raw_values)
+        assert all(len(row) == 5 for row in rows)
+
+    def test_custom_fields(self, app, guest_user):
+        """Test custom fields outside the standard getters are read from the item"""
+        batch = Batch(name='Guest Batch', filename='guest.csv', user_id=guest_user.id, status='uploaded')
+        db.session.add(batch)
+        db.session.commit()
+
+        email = Email(email='new@example.com', domain='example.com', batch_id=batch.id,
+                      uploaded_by=guest_user.id)
+        db.session.add(email)
+        db.session.commit()
+        db.session.add(GuestEmailItem(batch_id=batch.id, user_id=guest_user.id,
+                                      email_normalized='new@example.com', domain='example.com',
+                                      result='inserted', matched_email_id=email.id))
+        db.session.add(GuestEmailItem(batch_id=batch.id, user_id=guest_user.id,
+                                      email_normalized='bad@example.de', domain='example.de',
+                                      result='rejected', rejected_reason='cctld_policy',
+                                      rejected_details='Non-US ccTLD'))
+        db.session.commit()
+
+        # Start from an empty session so the export loads the rows itself
+        user_id, batch_id = guest_user.id, batch.id
+        db.session.expunge_all()
+
+        result = export_guest_emails_task.apply(
+            args=(user_id, batch_id),
+            kwargs={'custom_fields': ['email', 'status', 'rejected_details', 'matched_email']},
+            task_id='test-guest-export-custom'
+        ).get()
+
+        history = db.session.get(GuestDownloadHistory, result['history_id'])
+        rows = _read_csv(history.file_path)
+        assert rows[0] == ['Email', 'Status', 'Rejected Details', 'Matched Email']
+        assert sorted(rows[1:]) == [
+            ['bad@example.de', 'Rejected', 'Non-US ccTLD', ''],
+            ['new@example.com', 'Unverified', '', '<Email new@example.com>'],
+        ]
+
+class TestJoinCsvRows:
+    """Test the direct-join CSV fast path"""
+
+    def test_matches_csv_writer(self):
+        """Test joined rows are byte-identical to csv.writer, quoting only where needed"""
+        rows = [
+            ['user@example.com', 'example.com', 'inserted', 'Valid', '87'],
+            ['x,y@example.com', 'example.com', 'rejected', 'Rejected', ''],
+            ['say "hi"@example.com', 'example.com', 'rejected', 'Rejected', ''],
+            ['a\rb@example.com', 'example.com', 'rejected', 'Rejected', ''],
+            ['line\nbreak@example.com', 'example.com', 'rejected', 'Rejected', ''],
+            ['', '', 'rejected', 'Rejected', ''],
+        ]
+
+        expected = io.StringIO()
+        csv.writer(expected).writerows(rows)
+
+        assert ''.join(_join_csv_rows(iter(rows), 5)) == expected.getvalue()
@@ -0,0 +1,304 @@
+import pytest
+import os
+import tempfile
+
+from app import create_app, db
+from config import Config
+from sqlalchemy.exc import OperationalError
+from app.models.user import User
+from app.models.email import Email, Batch, GuestEmailItem, RejectedEmail
+from app.models.job import Job
+from app.jobs import tasks
+from app.jobs.tasks import import_emails_task
+
+@pytest.fixture
+def app():
+    """Create application for testing"""
+    app = create_app()
+    app.config['TESTING'] = True
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['CELERY_BROKER_URL'] = 'memory://'
+    app.config['CELERY_RESULT_BACKEND'] = 'cache+memory://'
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.drop_all()
+
+# PostgreSQL-only import paths (COPY) run against this database when it is set
+POSTGRES_URL = os.environ.get('TEST_POSTGRES_URL')
+requires_postgres = pytest.mark.skipif(not POSTGRES_URL, reason='TEST_POSTGRES_URL not set')
+
+@pytest.fixture
+def pg_app():
+    """Create application on the PostgreSQL test database"""
+    class PostgresConfig(Config):
+        SQLALCHEMY_DATABASE_URI = POSTGRES_URL
+    
+    app = create_app(PostgresConfig)
+    app.config['TESTING'] = True
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+@pytest.fixture
+def pg_user(pg_app):
+    """Create a regular user in the PostgreSQL test database"""
+    user = User(username='testuser', email='user@test.com', role='user')
+    user.set_password('password')
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+@pytest.fixture
+def guest_user(app):
+    """Create a guest user"""
+    user = User(username='testguest', email='guest@test.com', role='guest')
+    user.set_password('password')
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+@pytest.fixture
+def regular_user(app):
+    """Create a regular user"""
+    user = User(username='testuser', email='user@test.com', role='user')
+    user.set_password('password')
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+def _make_batch(user):
+    batch = Batch(name='Import Batch', filename='import.csv', user_id=user.id, status='processing')
+    db.session.add(batch)
+    db.session.commit()
+    return batch
+
+def _run_import(batch, user, lines, job_id='test-import-job', line_end='\n'):
+    """Write lines to a temporary CSV and run the import task on it synchronously"""
+    with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.csv', newline='') as f:
+        f.write(line_end.join(lines) + line_end)
+        csv_path = f.name
+
+    try:
+        return import_emails_task.apply(
+            args=(batch.id, csv_path, user.id),
+            kwargs={'consent_granted': True},
+            task_id=job_id
+        ).get()
+    finally:
+        os.unlink(csv_path)
+
+class TestRegularImport:
+    """Test imports by regular users"""
+
+    def test_rows_and_batch_stats(self, app, regular_user):
+        """Test valid, rejected and duplicate rows land in the right tables"""
+        batch = _make_batch(regular_user)
+
+        result = _run_import(batch, regular_user, [
+            'one@example.com',
+            'two@example.com',
+            'user@example.de',
+            'ONE@Example.com',
+        ])
+
+        assert result == {'status': 'completed', 'imported': 2, 'rejected': 1, 'duplicates': 1}
+
+        emails = Email.query.filter_by(batch_id=batch.id).order_by(Email.email).all()
+        assert [e.email for e in emails] == ['one@example.com', 'two@example.com']
+        assert all(e.uploaded_by == regular_user.id and e.consent_granted for e in emails)
+        assert all(not e.is_validated for e in emails)
+
+        reasons = sorted(r.reason for r in RejectedEmail.query.filter_by(batch_id=batch.id))
+        assert reasons == ['cctld_policy', 'duplicate']
+        assert GuestEmailItem.query.count() == 0
+
+        db.session.refresh(batch)
+        assert batch.total_count == 2
+        assert batch.rejected_count == 1
+        assert batch.duplicate_count == 1
+        assert batch.status == 'uploaded'
+
+    def test_in_file_duplicates_across_chunks(self, app, regular_user):
+        """Test a repeated address is caught when it falls in a later chunk"""
+        app.config['IMPORT_BATCH_SIZE'] = 2
+        batch = _make_batch(regular_user)
+
+        result = _run_import(batch, regular_user, [
+            'a@example.com',
+            'b@example.com',
+            'A@example.com',
+            'c@example.com',
+            'b@example.com',
+        ])
+
+        assert result['imported'] == 3
+        assert result['duplicates'] == 2
+        assert Email.query.filter_by(batch_id=batch.id).count() == 3
+        assert RejectedEmail.query.filter_by(batch_id=batch.id, reason='duplicate').count() == 2
+
+        db.session.refresh(batch)
+        assert batch.total_count == 3
+        assert batch.duplicate_count == 2
+
+    @pytest.mark.parametrize('line_end', ['\r', '\r\n', '\n'])
+    def test_line_endings(self, app, regular_user, line_end):
+        """Test files with CR-only, CRLF and LF line endings are split into rows"""
+        app.config['IMPORT_BATCH_SIZE'] = 2
+        batch = _make_batch(regular_user)
+
+        result = _run_import(batch, regular_user, [
+            'a@example.com',
+            '"b@example.com",note',
+            'c@example.com,other',
+        ], line_end=line_end)
+
+        assert result['imported'] == 3
+        assert sorted(e.email for e in Email.query.filter_by(batch_id=batch.id)) == [
+            'a@example.com', 'b@example.com', 'c@example.com'
+        ]
+
+        job = Job.query.filter_by(job_id='test-import-job').first()
+        assert job.total == 3
+
+class TestGuestImport:
+    """Test imports by guest users"""
+
+    def test_rows_and_batch_stats(self, app, guest_user, regular_user):
+        """Test guests insert only new emails and get an item for every row"""
+        existing_batch = _make_batch(regular_user)
+        existing = Email(email='dup@example.com', domain='example.com',
+                         batch_id=existing_batch.id, uploaded_by=regular_user.id)
+        db.session.add(existing)
+        db.session.commit()
+
+        batch = _make_batch(guest_user)
+        result = _run_import(batch, guest_user, [
+            'new@example.com',
+            'DUP@example.com',
+            'user@example.de',
+        ])
+
+        assert result == {'status': 'completed', 'imported': 1, 'rejected': 1, 'duplicates': 1}
+
+        new_email = Email.query.filter_by(batch_id=batch.id).one()
+        assert new_email.email == 'new@example.com'
+        assert Email.query.count() == 2
+
+        items = {item.email_normalized: item for item in GuestEmailItem.query.filter_by(batch_id=batch.id)}
+        assert set(items) == {'new@example.com', 'dup@example.com', 'user@example.de'}
+        assert items['new@example.com'].result == 'inserted'
+        assert items['new@example.com'].matched_email_id == new_email.id
+        assert items['dup@example.com'].result == 'duplicate'
+        assert items['dup@example.com'].matched_email_id == existing.id
+        assert items['user@example.de'].result == 'rejected'
+        assert items['user@example.de'].rejected_reason == 'cctld_policy'
+
+        db.session.refresh(batch)
+        assert batch.total_count == 1
+        assert batch.rejected_count == 1
+        assert batch.duplicate_count == 1
+
+    def test_in_file_duplicates(self, app, guest_user):
+        """Test a repeated address gets one guest item and is reported as a duplicate"""
+        batch = _make_batch(guest_user)
+
+        result = _run_import(batch, guest_user, ['a@example.com', 'b@example.com', 'a@example.com'])
+
+        assert result == {'status': 'completed', 'imported': 2, 'rejected': 0, 'duplicates': 1}
+        assert sorted(e.email for e in Email.query.filter_by(batch_id=batch.id)) == ['a@example.com', 'b@example.com']
+
+        items = GuestEmailItem.query.filter_by(batch_id=batch.id).all()
+        assert sorted(item.email_normalized for item in items) == ['a@example.com', 'b@example.com']
+        assert all(item.result == 'inserted' for item in items)
+
+        reject = RejectedEmail.query.filter_by(batch_id=batch.id).one()
+        assert (reject.email, reject.reason) == ('a@example.com', 'duplicate')
+
+        job = Job.query.filter_by(job_id='test-import-job').first()
+        assert job.errors == 0
+
+        db.session.refresh(batch)
+        assert batch.total_count == 2
+        assert batch.duplicate_count == 1
+
+class TestImportChunkFailure:
+    """Test that a chunk whose write fails is not reported as imported"""
+
+    def test_failed_chunk_counts_as_errors(self, app, regular_user, monkeypatch):
+        """Test counters are restored when a chunk insert is rolled back"""
+        app.config['IMPORT_BATCH_SIZE'] = 2
+        batch = _make_batch(regular_user)
+
+        # The first chunk's write fails; later chunks are written normally
+        flush_import_rows = tasks._flush_import_rows
+        calls = []
+
+        def failing_first_flush(*args):
+            calls.append(args)
+            if len(calls) == 1:
+                raise OperationalError('INSERT', {}, Exception('disk full'))
+            return flush_import_rows(*args)
+
+        monkeypatch.setattr(tasks, '_flush_import_rows', failing_first_flush)
+
+        result = _run_import(batch, regular_user, [
+            'a@example.com', 'user@example.de',
+            'b@example.com', 'c@example.com',
+        ])
+
+        assert result == {'status': 'completed', 'imported': 2, 'rejected': 0, 'duplicates': 0}
+        assert sorted(e.email for e in Email.query) == ['b@example.com', 'c@example.com']
+        assert RejectedEmail.query.count() == 0
+
+        job = Job.query.filter_by(job_id='test-import-job').first()
+        assert job.status == 'completed'
+        assert job.errors == 2
+
+        db.session.refresh(batch)
+        assert batch.total_count == 2
+        assert batch.rejected_count == 0
+
+@requires_postgres
+class TestCopyChunkFailure:
+    """Test that a chunk whose COPY fails is recovered like any other write"""
+
+    def test_failed_copy_counts_as_errors(self, pg_app, pg_user):
+        """Test a COPY error rolls back only its chunk and the import completes"""
+        pg_app.config['IMPORT_BATCH_SIZE'] = 200
+        batch = _make_batch(pg_user)
+
+        # First chunk: enough rejects to be written with COPY, one of them
+        # too long for rejected_emails.email; second chunk imports normally
+        lines = [f'bad{i}@@example.com' for i in range(149)] + ['x' * 300 + '@example.com']
+        lines += [f'first{i}@example.com' for i in range(50)]
+        lines += [f'second{i}@example.com' for i in range(30)]
+
+        result = _run_import(batch, pg_user, lines)
+
+        assert result == {'status': 'completed', 'imported': 30, 'rejected': 0, 'duplicates': 0}
+        assert Email.query.filter_by(batch_id=batch.id).count() == 30
+        assert RejectedEmail.query.count() == 0
+
+        job = Job.query.filter_by(job_id='test-import-job').first()
+        assert job.errors == 200
+
+class TestImportProgress:
+    """Test progress reported while importing"""
+
+    def test_task_state_percent_is_current(self, app, regular_user, monkeypatch):
+        """Test the PROGRESS meta carries the percent of the rows processed so far"""
+        app.config['PROGRESS_COMMIT_INTERVAL'] = 2
+        states = []
+        monkeypatch.setattr(import_emails_task, 'update_state',
+                            lambda state=None, meta=None, **kwargs: states.append(dict(meta)))
+
+        batch = _make_batch(regular_user)
+        _run_import(batch, regular_user, [f'user{i}@example.com' for i in range(4)])
+
+        assert [state['percent'] for state in states] == [50.0, 100.0]
+        assert [state['current'] for state in states] == [2, 4]
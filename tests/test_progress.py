@@ -0,0 +1,43 @@
+import pytest
+import socket
+import time
+
+from app import create_app
+from app.utils import progress
+from app.utils.progress import publish_progress, read_progress
+
+@pytest.fixture
+def silent_server():
+    """A listening socket that accepts connections but never replies"""
+    server = socket.socket()
+    server.bind(('127.0.0.1', 0))
+    server.listen(8)
+    yield server.getsockname()
+    server.close()
+
+@pytest.fixture
+def app(monkeypatch, silent_server):
+    """Create application whose Redis does not answer"""
+    host, port = silent_server
+    app = create_app()
+    app.config['TESTING'] = True
+    app.config['REDIS_URL'] = f'redis://{host}:{port}/0'
+    monkeypatch.setattr(progress, '_redis_client', None)
+    
+    with app.app_context():
+        yield app
+
+class TestProgressBestEffort:
+    """Test that progress reporting never blocks or fails its caller"""
+    
+    def test_publish_gives_up_quickly(self, app):
+        """Test publishing to an unreachable Redis returns False within the timeout"""
+        started = time.monotonic()
+        assert publish_progress('job-1', 10, 100) is False
+        assert time.monotonic() - started < progress.REDIS_SOCKET_TIMEOUT * 3
+    
+    def test_read_gives_up_quickly(self, app):
+        """Test reading from an unreachable Redis returns None within the timeout"""
+        started = time.monotonic()
+        assert read_progress('job-1') is None
+        assert time.monotonic() - started < progress.REDIS_SOCKET_TIMEOUT * 3
@@ -0,0 +1,122 @@
+import pytest
+
+from app import create_app, db, celery
+from app.models.user import User
+from app.models.email import Email, Batch
+from app.models.job import Job, SMTPConfig
+from app.jobs import tasks
+from app.jobs.tasks import validate_emails_task, fail_validation_task
+
+@pytest.fixture
+def app():
+    """Create application for testing"""
+    app = create_app()
+    app.config['TESTING'] = True
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['CELERY_BROKER_URL'] = 'memory://'
+    app.config['CELERY_RESULT_BACKEND'] = 'cache+memory://'
+    # Three emails give three chunks, so validation runs as a chord
+    app.config['VALIDATION_CHUNK_SIZE'] = 1
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.drop_all()
+
+@pytest.fixture
+def eager_celery():
+    """Run sub-tasks (the chunk chord) in process"""
+    celery.conf.task_always_eager = True
+    yield celery
+    celery.conf.task_always_eager = False
+
+@pytest.fixture
+def batch(app):
+    """Create a regular user's batch with three unvalidated emails"""
+    user = User(username='testuser', email='user@test.com', role='user')
+    user.set_password('password')
+    db.session.add(user)
+    db.session.commit()
+
+    batch = Batch(name='Validate Batch', filename='validate.csv', user_id=user.id, status='uploaded')
+    db.session.add(batch)
+    db.session.commit()
+
+    for address in ('one@example.com', 'two@example.com', 'three@example.com'):
+        db.session.add(Email(
+            email=address,
+            domain='example.com',
+            batch_id=batch.id,
+            uploaded_by=user.id,
+            is_validated=False
+        ))
+    db.session.commit()
+    return batch
+
+class TestChunkedValidation:
+    """Test validation runs split into a chord of chunk tasks"""
+
+    def test_chord_completes_job(self, app, eager_celery, batch):
+        """Test the chord callback completes the job with summed counters"""
+        validate_emails_task.apply(args=(batch.id, batch.user_id), task_id='test-validate').get()
+
+        job = Job.query.filter_by(job_id='test-validate').first()
+        assert job.status == 'completed'
+        assert job.result_data['valid'] + job.result_data['invalid'] == 3
+        assert Email.query.filter_by(is_validated=False).count() == 0
+
+    def test_failing_chunk_fails_job(self, app, eager_celery, batch, monkeypatch):
+        """Test a failing chunk marks the job failed instead of leaving it running"""
+        def failing_validate_rows(*args, **kwargs):
+            raise RuntimeError('chunk exploded')
+
+        monkeypatch.setattr(tasks, '_validate_rows', failing_validate_rows)
+
+        result = validate_emails_task.apply(args=(batch.id, batch.user_id), task_id='test-validate-fail')
+        assert result.failed()
+
+        job = Job.query.filter_by(job_id='test-validate-fail').first()
+        assert job.status == 'failed'
+        assert 'chunk exploded' in job.error_message
+
+    def test_error_callback_fails_job(self, app, batch):
+        """Test the chord error callback marks a running job failed"""
+        job = Job(job_id='test-validate-errback', job_type='validate', user_id=batch.user_id,
+                  batch_id=batch.id, status='running')
+        db.session.add(job)
+        db.session.commit()
+
+        fail_validation_task(None, RuntimeError('chunk exploded'), None, 'test-validate-errback')
+
+        db.session.refresh(job)
+        assert job.status == 'failed'
+        assert job.error_message == 'chunk exploded'
+
+class TestSmtpValidation:
+    """Test validation through configured SMTP servers"""
+
+    def test_publishes_live_progress(self, app, batch, monkeypatch):
+        """Test the SMTP loop publishes Redis progress like the other paths"""
+        from app.utils import email_validator
+
+        app.config['PROGRESS_REPORT_INTERVAL'] = 0
+        for i in range(47):
+            db.session.add(Email(email=f'more{i}@example.com', domain='example.com', batch_id=batch.id,
+                                 uploaded_by=batch.user_id, is_validated=False))
+        db.session.add(SMTPConfig(name='Test SMTP', smtp_host='smtp.test', smtp_port=25,
+                                  from_email='verify@test.com', is_active=True))
+        db.session.commit()
+
+        published = []
+        monkeypatch.setattr(email_validator, 'verify_email_smtp', lambda email, *args, **kwargs: (True, 250, None))
+        monkeypatch.setattr(tasks, 'publish_progress',
+                            lambda job_id, processed, total, errors=0: published.append((job_id, processed, total)))
+
+        validate_emails_task.apply(args=(batch.id, batch.user_id), kwargs={'use_smtp': True},
+                                   task_id='test-validate-smtp').get()
+
+        assert published == [('test-validate-smtp', 50, 50)]
+        job = Job.query.filter_by(job_id='test-validate-smtp').first()
+        assert job.status == 'completed'
+        assert Email.query.filter_by(is_validated=True, is_valid=True, quality_score=100).count() == 50
+        assert SMTPConfig.query.one().last_used_at is not None